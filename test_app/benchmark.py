@@ -0,0 +1,422 @@
+"""
+Synthetic dataset and timing scenarios for the helpdesk list endpoints.
+
+Seeded records are marked with BENCH_PREFIX so that they can be told apart
+from (and removed without touching) real data. See test_app/commands for the
+bench commands wrapping these functions.
+"""
+
+import json
+import random
+import time
+from contextlib import contextmanager
+
+import frappe
+from frappe.utils import add_to_date, cint, now_datetime
+
+
+BENCH_PREFIX = "bench"
+BENCH_DOMAIN = "bench.example.com"
+SEED_CHUNK_SIZE = 5000
+
+DEFAULT_VOLUMES = {
+    "tickets": 10000,
+    "communications": 3,  # per ticket
+    "comments": 1,  # per ticket
+    "todos": 1,  # per ticket
+    "teams": 10,
+    "agents": 50,
+    "customers": 500,
+}
+
+
+def seed(**volumes):
+    """Insert a synthetic dataset with bulk inserts (no document hooks run)."""
+    # an explicit 0 (e.g. `--teams 0`) is kept, only missing volumes use the default
+    volumes = {
+        key: value if volumes.get(key) is None else cint(volumes[key])
+        for key, value in DEFAULT_VOLUMES.items()
+    }
+    rng = random.Random(42)
+    now = now_datetime()
+
+    agents = seed_agents(volumes["agents"])
+    teams = seed_teams(volumes["teams"], agents, rng)
+    customers = seed_customers(volumes["customers"])
+
+    statuses = get_statuses()
+    priorities = frappe.get_all("HD Ticket Priority", pluck="name") or [None]
+    ticket_types = frappe.get_all("HD Ticket Type", pluck="name") or [None]
+    agent_names = {agent: full_name for agent, full_name in agents}
+
+    fields = [
+        "subject",
+        "status",
+        "status_category",
+        "priority",
+        "ticket_type",
+        "agent_group",
+        "customer",
+        "raised_by",
+        "opening_date",
+        "_assign",
+        "custom_primary_assignee",
+        "custom_primary_assignee_full_name",
+        "owner",
+        "modified_by",
+        "creation",
+        "modified",
+    ]
+    values = []
+    for i in range(volumes["tickets"]):
+        if len(values) >= SEED_CHUNK_SIZE:
+            frappe.db.bulk_insert("HD Ticket", fields, values)
+            values = []
+        status, category = rng.choice(statuses)
+        assignee = rng.choice(list(agent_names)) if rng.random() < 0.8 else None
+        created = add_to_date(now, minutes=-rng.randint(0, 60 * 24 * 365))
+        raised_by = f"customer{rng.randint(1, max(volumes['customers'], 1) * 4)}@{BENCH_DOMAIN}"
+        priority = rng.choice(priorities)
+        ticket_type = rng.choice(ticket_types)
+        team = rng.choice(teams) if teams and rng.random() < 0.9 else None
+        values.append(
+            (
+                f"{BENCH_PREFIX}: synthetic ticket {i}",
+                status,
+                category,
+                priority,
+                ticket_type,
+                team,
+                rng.choice(customers) if customers and rng.random() < 0.7 else None,
+                raised_by,
+                created.date(),
+                json.dumps([assignee]) if assignee else None,
+                assignee,
+                agent_names.get(assignee),
+                raised_by,
+                raised_by,
+                created,
+                add_to_date(created, minutes=rng.randint(0, 60 * 24 * 7)),
+            )
+        )
+    frappe.db.bulk_insert("HD Ticket", fields, values)
+
+    tickets = frappe.get_all(
+        "HD Ticket",
+        filters={"subject": ["like", f"{BENCH_PREFIX}: %"]},
+        fields=["name", "raised_by", "creation", "custom_primary_assignee"],
+    )
+    # children are built per chunk, long email bodies add up quickly
+    for chunk in chunks(tickets, SEED_CHUNK_SIZE):
+        seed_ticket_children(chunk, volumes, list(agent_names), rng)
+        frappe.db.commit()
+    return volumes
+
+
+def seed_agents(count):
+    users = [
+        (f"{BENCH_PREFIX}-agent-{i}@{BENCH_DOMAIN}", f"Bench Agent {i}") for i in range(count)
+    ]
+    now = now_datetime()
+    frappe.db.bulk_insert(
+        "User",
+        ["name", "email", "first_name", "full_name", "user_type", "enabled", "creation", "modified"],
+        [(user, user, full_name, full_name, "System User", 1, now, now) for user, full_name in users],
+        ignore_duplicates=True,
+    )
+    # without the Agent role the seeded agents could not read tickets
+    frappe.db.bulk_insert(
+        "Has Role",
+        ["name", "parent", "parenttype", "parentfield", "role", "creation", "modified"],
+        [
+            (f"{user}-agent-role", user, "User", "roles", "Agent", now, now)
+            for user, _full_name in users
+        ],
+        ignore_duplicates=True,
+    )
+    frappe.db.bulk_insert(
+        "HD Agent",
+        ["name", "user", "agent_name", "is_active", "creation", "modified"],
+        [(user, user, full_name, 1, now, now) for user, full_name in users],
+        ignore_duplicates=True,
+    )
+    return users
+
+
+def seed_teams(count, agents, rng):
+    teams = [f"{BENCH_PREFIX}-team-{i}" for i in range(count)]
+    now = now_datetime()
+    frappe.db.bulk_insert(
+        "HD Team",
+        ["name", "team_name", "creation", "modified"],
+        [(team, team, now, now) for team in teams],
+        ignore_duplicates=True,
+    )
+    members = []
+    for idx, (agent, _full_name) in enumerate(agents):
+        team = teams[idx % len(teams)] if teams else None
+        if team:
+            members.append(
+                (frappe.generate_hash(length=10), team, "HD Team", "users", agent, now, now)
+            )
+    frappe.db.bulk_insert(
+        "HD Team Member",
+        ["name", "parent", "parenttype", "parentfield", "user", "creation", "modified"],
+        members,
+    )
+    return teams
+
+
+def seed_customers(count):
+    customers = [f"{BENCH_PREFIX}-customer-{i}" for i in range(count)]
+    now = now_datetime()
+    frappe.db.bulk_insert(
+        "HD Customer",
+        ["name", "customer_name", "creation", "modified"],
+        [(customer, customer, now, now) for customer in customers],
+        ignore_duplicates=True,
+    )
+    return customers
+
+
+def seed_ticket_children(tickets, volumes, agents, rng):
+    communications, comments, todos = [], [], []
+    for ticket in tickets:
+        for i in range(volumes["communications"]):
+            received = i % 2 == 0
+            created = add_to_date(ticket.creation, minutes=i * 30)
+            communications.append(
+                (
+                    frappe.generate_hash(length=10),
+                    "Communication",
+                    "Email",
+                    "Received" if received else "Sent",
+                    f"{BENCH_PREFIX}: message {i}",
+                    "<p>" + " ".join(["lorem ipsum"] * rng.randint(5, 200)) + "</p>",
+                    ticket.raised_by if received else rng.choice(agents),
+                    rng.choice(agents) if received else ticket.raised_by,
+                    "HD Ticket",
+                    ticket.name,
+                    created,
+                    created,
+                    created,
+                )
+            )
+        for i in range(volumes["comments"]):
+            created = add_to_date(ticket.creation, minutes=i * 45)
+            comments.append(
+                (
+                    frappe.generate_hash(length=10),
+                    ticket.name,
+                    rng.choice(agents),
+                    f"<p>{BENCH_PREFIX}: comment {i}</p>",
+                    created,
+                    created,
+                )
+            )
+        if ticket.custom_primary_assignee:
+            for i in range(volumes["todos"]):
+                todos.append(
+                    (
+                        frappe.generate_hash(length=10),
+                        "Open",
+                        ticket.custom_primary_assignee,
+                        "HD Ticket",
+                        ticket.name,
+                        f"{BENCH_PREFIX}: assignment",
+                        ticket.creation,
+                        ticket.creation,
+                    )
+                )
+
+    frappe.db.bulk_insert(
+        "Communication",
+        [
+            "name",
+            "communication_type",
+            "communication_medium",
+            "sent_or_received",
+            "subject",
+            "content",
+            "sender",
+            "recipients",
+            "reference_doctype",
+            "reference_name",
+            "communication_date",
+            "creation",
+            "modified",
+        ],
+        communications,
+    )
+    frappe.db.bulk_insert(
+        "HD Ticket Comment",
+        ["name", "reference_ticket", "commented_by", "content", "creation", "modified"],
+        comments,
+    )
+    frappe.db.bulk_insert(
+        "ToDo",
+        [
+            "name",
+            "status",
+            "allocated_to",
+            "reference_type",
+            "reference_name",
+            "description",
+            "creation",
+            "modified",
+        ],
+        todos,
+    )
+
+
+def get_statuses():
+    if frappe.db.exists("DocType", "HD Ticket Status"):
+        statuses = frappe.get_all("HD Ticket Status", fields=["name", "category"], as_list=True)
+        if statuses:
+            return statuses
+    return [("Open", "Open"), ("Replied", "Paused"), ("Resolved", "Resolved"), ("Closed", "Resolved")]
+
+
+def clear():
+    """Remove everything created by `seed`."""
+    tickets = frappe.get_all(
+        "HD Ticket", filters={"subject": ["like", f"{BENCH_PREFIX}: %"]}, pluck="name"
+    )
+    for chunk in chunks(tickets, 1000):
+        frappe.db.delete("Communication", {"reference_doctype": "HD Ticket", "reference_name": ["in", chunk]})
+        frappe.db.delete("HD Ticket Comment", {"reference_ticket": ["in", chunk]})
+        frappe.db.delete("ToDo", {"reference_type": "HD Ticket", "reference_name": ["in", chunk]})
+        frappe.db.delete("HD Ticket", {"name": ["in", chunk]})
+
+    frappe.db.delete("HD Team Member", {"parent": ["like", f"{BENCH_PREFIX}-team-%"]})
+    frappe.db.delete("HD Team", {"name": ["like", f"{BENCH_PREFIX}-team-%"]})
+    frappe.db.delete("HD Customer", {"name": ["like", f"{BENCH_PREFIX}-customer-%"]})
+    frappe.db.delete("HD Agent", {"name": ["like", f"%@{BENCH_DOMAIN}"]})
+    frappe.db.delete("Has Role", {"parenttype": "User", "parent": ["like", f"%@{BENCH_DOMAIN}"]})
+    frappe.db.delete("User", {"name": ["like", f"%@{BENCH_DOMAIN}"]})
+    frappe.db.commit()
+
+
+def chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def get_scenarios():
+    """Named endpoint calls, each returning the endpoint's response."""
+    from helpdesk.api.doc import (
+        get_filterable_fields,
+        get_list_data,
+        get_quick_filters,
+        sort_options,
+    )
+
+    def deep_page():
+        cursor = None
+        for _page in range(10):
+            cursor = get_list_data("HD Ticket", page_length=20, cursor=cursor)["next_cursor"]
+            if not cursor:
+                break
+
+    return {
+        "list_default": lambda: get_list_data("HD Ticket", page_length=20, is_default=True),
+        "list_filtered": lambda: get_list_data(
+            "HD Ticket", filters={"status": "Open"}, page_length=20
+        ),
+        "list_deep_page": deep_page,
+        "list_approximate_count": lambda: get_list_data(
+            "HD Ticket", page_length=20, approximate_count=True
+        ),
+        "list_group_by_team": lambda: get_list_data(
+            "HD Ticket",
+            page_length=20,
+            view={"view_type": "group_by", "group_by_field": "agent_group"},
+            group_page_length=10,
+        ),
+        "filterable_fields": lambda: get_filterable_fields("HD Ticket"),
+        "quick_filters": lambda: get_quick_filters("HD Ticket"),
+        "sort_options": lambda: sort_options("HD Ticket"),
+    }
+
+
+@contextmanager
+def count_queries():
+    """Counts `frappe.db.sql` calls made inside the block."""
+    counter = {"queries": 0}
+    db_class = frappe.db.__class__
+    orig_sql = db_class.sql
+
+    def sql(self, *args, **kwargs):
+        counter["queries"] += 1
+        return orig_sql(self, *args, **kwargs)
+
+    db_class.sql = sql
+    try:
+        yield counter
+    finally:
+        db_class.sql = orig_sql
+
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))]
+
+
+def run(users=None, iterations=20, scenarios=None):
+    """
+    Time every scenario as each of `users`. Returns the results keyed by
+    "<scenario>:<user>" with p50/p95 latency in ms and DB queries per call.
+    """
+    users = users or ["Administrator", f"{BENCH_PREFIX}-agent-0@{BENCH_DOMAIN}"]
+    available = get_scenarios()
+    names = scenarios or list(available)
+    results = {}
+    current_user = frappe.session.user
+    try:
+        for user in users:
+            frappe.set_user(user)
+            for name in names:
+                scenario = available[name]
+                scenario()  # warm up
+                timings, queries = [], []
+                for _i in range(cint(iterations)):
+                    with count_queries() as counter:
+                        start = time.perf_counter()
+                        scenario()
+                        timings.append((time.perf_counter() - start) * 1000)
+                    queries.append(counter["queries"])
+                results[f"{name}:{user}"] = {
+                    "p50_ms": round(percentile(timings, 0.5), 2),
+                    "p95_ms": round(percentile(timings, 0.95), 2),
+                    "queries": max(queries),
+                }
+    finally:
+        frappe.set_user(current_user)
+
+    return {
+        "recorded_on": str(now_datetime()),
+        "ticket_count": frappe.db.count("HD Ticket"),
+        "iterations": cint(iterations),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.2):
+    """
+    Returns a list of regressions: p95 latency more than `tolerance` above the
+    baseline, or more DB queries than the baseline made.
+    """
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        result = current["results"].get(key)
+        if not result:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: p95 {result['p95_ms']}ms > baseline {base['p95_ms']}ms (+{int(tolerance * 100)}%)"
+            )
+        if result["queries"] > base["queries"]:
+            regressions.append(
+                f"{key}: {result['queries']} queries > baseline {base['queries']}"
+            )
+    return regressions
@@ -0,0 +1,100 @@
+import json
+
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("helpdesk-bench-seed")
+@click.option("--tickets", type=int, default=10000, help="Number of tickets")
+@click.option("--communications", type=int, default=3, help="Emails per ticket")
+@click.option("--comments", type=int, default=1, help="Comments per ticket")
+@click.option("--todos", type=int, default=1, help="Assignments per assigned ticket")
+@click.option("--teams", type=int, default=10, help="Number of teams")
+@click.option("--agents", type=int, default=50, help="Number of agents")
+@click.option("--customers", type=int, default=500, help="Number of customers")
+@click.option("--clear", is_flag=True, default=False, help="Remove seeded data instead")
+@pass_context
+def helpdesk_bench_seed(context, clear=False, **volumes):
+    "Seed the site with a synthetic helpdesk dataset for benchmarking"
+    import frappe
+
+    from test_app import benchmark
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        if clear:
+            benchmark.clear()
+            click.echo("Removed benchmark data")
+        else:
+            volumes = benchmark.seed(**volumes)
+            click.echo(f"Seeded {volumes}")
+    finally:
+        frappe.destroy()
+
+
+@click.command("helpdesk-bench-run")
+@click.option("--user", "users", multiple=True, help="Run scenarios as this user (repeatable)")
+@click.option("--scenario", "scenarios", multiple=True, help="Only run this scenario (repeatable)")
+@click.option("--iterations", type=int, default=20)
+@click.option("--output", help="Write results to this JSON file (e.g. to record a baseline)")
+@click.option("--baseline", help="Compare against this JSON baseline, fail on regressions")
+@click.option("--tolerance", type=float, default=0.2, help="Allowed p95 slowdown vs baseline")
+@pass_context
+def helpdesk_bench_run(context, users, scenarios, iterations, output, baseline, tolerance):
+    "Time the list endpoints (p50/p95 latency and DB queries per call)"
+    import frappe
+
+    from test_app import benchmark
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        results = benchmark.run(
+            users=list(users) or None,
+            iterations=iterations,
+            scenarios=list(scenarios) or None,
+        )
+    finally:
+        frappe.destroy()
+
+    for key, result in results["results"].items():
+        click.echo(
+            f"{key:<60} p50 {result['p50_ms']:>9}ms  p95 {result['p95_ms']:>9}ms  queries {result['queries']}"
+        )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=1)
+
+    if baseline:
+        with open(baseline) as f:
+            regressions = benchmark.compare(results, json.load(f), tolerance=tolerance)
+        if regressions:
+            click.secho("\n".join(regressions), fg="red")
+            raise SystemExit(1)
+        click.secho("No regressions against baseline", fg="green")
+
+
+@click.command("helpdesk-rebuild-timeline")
+@click.option("--ticket", help="Only rebuild the timeline of this ticket")
+@pass_context
+def helpdesk_rebuild_timeline(context, ticket=None):
+    "Recreate the ticket timeline table from comments, emails, activities, views and calls"
+    import frappe
+
+    from test_app.timeline import rebuild_timeline
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        rebuild_timeline(ticket=ticket)
+        click.echo(f"Rebuilt ticket timeline on {site}")
+    finally:
+        frappe.destroy()
+
+
+commands = [helpdesk_bench_seed, helpdesk_bench_run, helpdesk_rebuild_timeline]
@@ -0,0 +1,74 @@
+import pickle
+
+import frappe
+
+CUSTOMER_CACHE = "customer_projection"
+
+
+def get_customer_projection(customer: str) -> dict | None:
+    """Cached summary of one HD Customer, None if it does not exist."""
+    if not customer:
+        return None
+    return get_customer_projections([customer]).get(customer)
+
+
+def get_customer_projections(customers) -> dict:
+    """
+    Summary ({"name", "customer_name", "customercode", "product", "status",
+    "has_alert"}) of many HD Customers, keyed by name. Customers not cached yet
+    are fetched with a single query; names that do not exist are left out.
+    """
+    customers = list({c for c in customers if c})
+    if not customers:
+        return {}
+
+    cache = frappe.cache()
+    projections = {}
+    values = cache.hmget(cache.make_key(CUSTOMER_CACHE), customers)
+    for customer, value in zip(customers, values):
+        if value is not None:
+            projections[customer] = pickle.loads(value)
+
+    missing = [c for c in customers if c not in projections]
+    if missing:
+        QBCustomer = frappe.qb.DocType("HD Customer")
+        QBAlert = frappe.qb.DocType("Customer Alert")
+        rows = (
+            frappe.qb.from_(QBCustomer)
+            .left_join(QBAlert)
+            .on(QBAlert.customer_name == QBCustomer.name)
+            .select(
+                QBCustomer.name,
+                QBCustomer.customer_name,
+                QBCustomer.custom_customercode.as_("customercode"),
+                QBCustomer.custom_productname.as_("product"),
+                QBCustomer.custom_status.as_("status"),
+                QBAlert.name.as_("alert"),
+            )
+            .where(QBCustomer.name.isin(missing))
+            .run(as_dict=True)
+        )
+        for row in rows:
+            projection = {
+                "name": row.name,
+                "customer_name": row.customer_name,
+                "customercode": row.customercode or "",
+                "product": row.product or "",
+                "status": row.status,
+                "has_alert": bool(row.alert),
+            }
+            projections[row.name] = projection
+            cache.hset(CUSTOMER_CACHE, row.name, projection)
+    return projections
+
+
+def clear_customer_projection(customer: str):
+    frappe.cache().hdel(CUSTOMER_CACHE, customer)
+
+
+def on_customer_alert_change(doc, method=None):
+    """Customer Alert hook: the alert flag of the customer may have changed."""
+    clear_customer_projection(doc.customer_name)
+    before = doc.get_doc_before_save() if method == "on_update" else None
+    if before and before.customer_name != doc.customer_name:
+        clear_customer_projection(before.customer_name)
@@ -1,5 +1,9 @@
 import frappe
 
+from test_app.list_cache import clear_list_fields_cache
+from test_app.ticket_cache import clear_ticket_meta_cache
+
+
 def custom_field_updated(doc, method):
     """
     Automatically clear cache and reload metadata when a Custom Field is
@@ -12,3 +16,33 @@ def custom_field_updated(doc, method):
             frappe.msgprint("HD Customer fields updated and cache cleared. Changes will reflect automatically.")
     except Exception as e:
         frappe.log_error(f"Custom field update handler failed: {e}")
+
+
+def custom_field_changed(doc, method):
+    """Custom Fields add, remove and relabel list fields"""
+    clear_list_fields_cache(doc.dt)
+    if doc.dt == "HD Ticket":
+        clear_ticket_meta_cache()
+
+
+def property_setter_updated(doc, method):
+    """Property Setters change labels, options and visibility of list fields"""
+    clear_list_fields_cache(doc.doc_type)
+    if doc.doc_type == "HD Ticket":
+        clear_ticket_meta_cache()
+
+
+def doctype_updated(doc, method):
+    clear_list_fields_cache(doc.name)
+    if doc.name == "HD Ticket":
+        clear_ticket_meta_cache()
+
+
+def ticket_template_updated(doc, method):
+    """Customer portal list fields follow `hide_from_customer` of the template"""
+    clear_list_fields_cache("HD Ticket")
+    clear_ticket_meta_cache()
+
+
+def form_script_updated(doc, method):
+    clear_ticket_meta_cache()
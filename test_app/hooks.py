@@ -156,6 +156,10 @@ doc_events = {
     #     "before_save": "test_app.ticket_location.capture_agent_location"
     # }
     "HD Ticket": {
+        "after_insert": [
+            "test_app.list_cache.on_ticket_insert_or_trash",
+            "test_app.list_cache.on_ticket_insert_for_responses",
+        ],
         "on_update": [
             "test_app.utils.clear_ticket_todo_on_unassign",
             "test_app.utils.notify_ticket_status_change",
@@ -163,8 +167,94 @@ doc_events = {
             "test_app.utils.handle_start_ticket_assignment",
             "test_app.utils.prevent_frappe_auto_assignment",
             # "test_app.utils.auto_assign_on_start"
-        ]
-    }
+            "test_app.list_cache.on_ticket_update",
+            "test_app.list_cache.on_ticket_change_for_responses",
+        ],
+        "on_trash": [
+            "test_app.list_cache.on_ticket_insert_or_trash",
+            "test_app.list_cache.on_ticket_change_for_responses",
+            "test_app.timeline.remove_ticket_timeline",
+            "test_app.view_state.remove_ticket_view_states",
+        ],
+    },
+    "ToDo": {
+        "on_update": "test_app.utils.sync_primary_assignee_from_todo",
+        "on_trash": "test_app.utils.sync_primary_assignee_from_todo",
+    },
+    "User": {
+        "after_insert": "test_app.ticket_cache.clear_user_info_cache",
+        "on_update": [
+            "test_app.utils.update_primary_assignee_full_name",
+            "test_app.ticket_cache.clear_user_info_cache",
+            "test_app.permissions.on_user_change",
+        ],
+        "on_trash": "test_app.ticket_cache.clear_user_info_cache",
+    },
+    "Communication": {
+        "validate": "test_app.thread.set_communication_preview",
+        "on_update": "test_app.timeline.sync_timeline_event",
+        "on_trash": "test_app.timeline.remove_timeline_event",
+    },
+    "HD Ticket Comment": {
+        "on_update": "test_app.timeline.sync_timeline_event",
+        "on_trash": "test_app.timeline.remove_timeline_event",
+    },
+    "HD Ticket Activity": {
+        "on_update": "test_app.timeline.sync_timeline_event",
+        "on_trash": "test_app.timeline.remove_timeline_event",
+    },
+    "TP Call Log": {
+        "on_update": "test_app.timeline.sync_timeline_event",
+        "on_trash": "test_app.timeline.remove_timeline_event",
+    },
+    "Customer Alert": {
+        "on_update": "test_app.customer_cache.on_customer_alert_change",
+        "on_trash": "test_app.customer_cache.on_customer_alert_change",
+    },
+    "HD Team": {
+        "on_update": "test_app.permissions.clear_all_permission_contexts",
+        "after_rename": "test_app.permissions.clear_all_permission_contexts",
+        "on_trash": "test_app.permissions.clear_all_permission_contexts",
+    },
+    "HD Agent": {
+        "on_update": "test_app.permissions.on_agent_change",
+        "on_trash": "test_app.permissions.on_agent_change",
+    },
+    "Contact": {
+        "on_update": "test_app.permissions.on_contact_change",
+        "on_trash": "test_app.permissions.on_contact_change",
+    },
+    "HD Customer": {
+        "on_update": "test_app.permissions.clear_all_permission_contexts",
+        "on_trash": "test_app.permissions.clear_all_permission_contexts",
+    },
+    "HD Settings": {
+        "on_update": "test_app.permissions.clear_all_permission_contexts",
+    },
+    "Custom Field": {
+        "on_update": "test_app.events.custom_field_changed",
+        "on_trash": "test_app.events.custom_field_changed",
+    },
+    "Property Setter": {
+        "on_update": "test_app.events.property_setter_updated",
+        "on_trash": "test_app.events.property_setter_updated",
+    },
+    "DocType": {
+        "on_update": "test_app.events.doctype_updated",
+    },
+    "File": {
+        "after_insert": "test_app.ticket_cache.clear_attachments_cache",
+        "on_update": "test_app.ticket_cache.clear_attachments_cache",
+        "on_trash": "test_app.ticket_cache.clear_attachments_cache",
+    },
+    "HD Ticket Template": {
+        "on_update": "test_app.events.ticket_template_updated",
+        "on_trash": "test_app.events.ticket_template_updated",
+    },
+    "HD Form Script": {
+        "on_update": "test_app.events.form_script_updated",
+        "on_trash": "test_app.events.form_script_updated",
+    },
 }
 
 
@@ -288,7 +378,7 @@ fixtures = [
     {
         "dt": "Custom Field",
         "filters": [
-            ["dt", "in", ["HD Ticket", "HD Customer"]]
+            ["dt", "in", ["HD Ticket", "HD Customer", "Communication"]]
         ]
     },
     {
@@ -302,7 +392,7 @@ fixtures = [
     "HD Ticket Template",
     {
         "dt": "Custom Field",
-        "filters": [["dt", "in", ["HD Ticket", "HD Customer"]]]
+        "filters": [["dt", "in", ["HD Ticket", "HD Customer", "Communication"]]]
     },
     {
         "dt": "Property Setter",
@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+
+import frappe
+
+LABEL_CACHE_SIZE = 2048
+LABEL_CACHE_TTL = 60
+
+
+class LRUCache:
+    """Small process-local LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self.data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self.data[key]
+            return default
+        self.data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self.data[key] = (value, time.monotonic() + self.ttl)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+
+
+_label_cache = LRUCache(LABEL_CACHE_SIZE, LABEL_CACHE_TTL)
+_missing = object()
+
+
+def get_labels(doctype: str, names, label_field: str) -> dict:
+    """
+    Resolve `label_field` of many `doctype` records at once. Values not cached yet
+    are fetched with a single query; names that do not exist map to None.
+    """
+    site = getattr(frappe.local, "site", None)
+    labels = {}
+    missing = []
+    for name in set(names):
+        if not name:
+            continue
+        key = (site, doctype, label_field, name)
+        cached = _label_cache.get(key, _missing)
+        if cached is _missing:
+            missing.append(name)
+        else:
+            labels[name] = cached
+
+    if missing:
+        found = dict(
+            frappe.get_all(
+                doctype,
+                filters={"name": ["in", missing]},
+                fields=["name", label_field],
+                as_list=True,
+            )
+        )
+        for name in missing:
+            labels[name] = found.get(name)
+            _label_cache.set((site, doctype, label_field, name), labels[name])
+
+    return labels
+
+
+def clear_label_cache():
+    _label_cache.clear()
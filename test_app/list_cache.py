@@ -0,0 +1,317 @@
+import functools
+import hashlib
+import json
+import time
+
+import frappe
+from frappe.utils import cint, sbool
+
+from test_app.permissions import get_permission_context
+
+# Short lived, counts only need to be roughly live for list views
+COUNT_CACHE_TTL = 30
+# In approximate mode counting stops after this many rows
+APPROXIMATE_COUNT_LIMIT = 10000
+# Safety net for metadata changes that bypass the document hooks
+LIST_FIELDS_CACHE_TTL = 24 * 60 * 60
+# Only these doctypes have the hooks that invalidate cached counts and lists
+CACHED_LIST_DOCTYPES = ("HD Ticket",)
+
+
+def get_total_count(doctype: str, filters, approximate=False):
+    """
+    Returns (count, is_estimated) for `doctype` rows matching `filters` as seen by
+    the session user. Ticket counts are cached per (permission scope, filters)
+    and the cache is dropped when a ticket is added, removed or a filtered field
+    changes; other doctypes are counted on every call.
+    """
+    approximate = bool(cint(approximate))
+    if doctype not in CACHED_LIST_DOCTYPES:
+        if approximate:
+            return get_approximate_count(doctype, filters)
+        return count_rows(doctype, filters), False
+
+    key = get_count_cache_key(doctype, filters, approximate)
+    cached = frappe.cache().get_value(key)
+    if cached is not None:
+        return cached["count"], cached["is_estimated"]
+
+    if approximate:
+        count, is_estimated = get_approximate_count(doctype, filters)
+    else:
+        count = count_rows(doctype, filters)
+        is_estimated = False
+
+    track_filter_fields(doctype, filters)
+    frappe.cache().set_value(
+        key,
+        {"count": count, "is_estimated": is_estimated},
+        expires_in_sec=COUNT_CACHE_TTL,
+    )
+    return count, is_estimated
+
+
+def count_rows(doctype: str, filters) -> int:
+    return frappe.get_list(doctype, filters=filters, fields="count(*) as count")[0].count
+
+
+def get_approximate_count(doctype: str, filters):
+    """
+    Counts at most APPROXIMATE_COUNT_LIMIT matching rows. When the limit is hit the
+    limit itself is returned as a lower bound and flagged as estimated.
+    """
+    query = frappe.get_list(
+        doctype,
+        filters=filters,
+        fields=[f"`tab{doctype}`.name"],
+        limit=APPROXIMATE_COUNT_LIMIT + 1,
+        run=0,
+    )
+    count = frappe.db.sql(f"select count(*) from ({query}) as matched")[0][0]
+    if count > APPROXIMATE_COUNT_LIMIT:
+        return APPROXIMATE_COUNT_LIMIT, True
+    return count, False
+
+
+def get_permission_scope(doctype: str, user: str | None = None) -> str:
+    """
+    Identifies the set of rows `user` is allowed to see in list queries. Users
+    that can see every ticket share one scope, and so share cached counts.
+    """
+    user = user or frappe.session.user
+    if doctype == "HD Ticket":
+        context = get_permission_context(user)
+        if context.is_admin or (context.is_agent and not context.restrict_by_team):
+            return "all"
+    return user
+
+
+def get_count_cache_key(doctype: str, filters, approximate=False) -> str:
+    filters_hash = hashlib.sha256(normalize_filters(filters).encode()).hexdigest()
+    return "list_count::{0}::{1}::{2}::{3}::{4}".format(
+        doctype,
+        get_generation(doctype),
+        get_permission_scope(doctype),
+        int(approximate),
+        filters_hash,
+    )
+
+
+def normalize_filters(filters) -> str:
+    """Stable string form of `filters` so equivalent filters share a cache key."""
+    if isinstance(filters, dict):
+        return json.dumps(filters, sort_keys=True, default=str)
+    items = [json.dumps(f, sort_keys=True, default=str) for f in filters or []]
+    return json.dumps(sorted(items))
+
+
+def get_filter_fields(filters) -> set[str]:
+    if isinstance(filters, dict):
+        return set(filters.keys())
+
+    fields = set()
+    for f in filters or []:
+        if isinstance(f, dict):
+            fields.update(f.keys())
+        elif isinstance(f, (list, tuple)) and len(f) == 4:
+            fields.add(f[1])
+        elif isinstance(f, (list, tuple)) and f:
+            fields.add(f[0])
+    return fields
+
+
+def get_generation(doctype: str) -> str:
+    return frappe.cache().get_value(f"list_count_generation::{doctype}") or "0"
+
+
+def clear_count_cache(doctype: str):
+    """Invalidate every cached count of `doctype` by moving to a new generation."""
+    frappe.cache().set_value(
+        f"list_count_generation::{doctype}", frappe.generate_hash(length=10)
+    )
+
+
+def track_filter_fields(doctype: str, filters):
+    fields = get_filter_fields(filters)
+    if fields:
+        frappe.cache().sadd(f"list_count_fields::{doctype}", *fields)
+
+
+def on_ticket_insert_or_trash(doc, method=None):
+    clear_count_cache(doc.doctype)
+
+
+def on_ticket_update(doc, method=None):
+    """Drop cached counts if a field used by a cached filter was changed."""
+    fields = frappe.cache().smembers(f"list_count_fields::{doc.doctype}") or []
+    for fieldname in fields:
+        if isinstance(fieldname, bytes):
+            fieldname = fieldname.decode()
+        if doc.has_value_changed(fieldname):
+            clear_count_cache(doc.doctype)
+            return
+
+
+def get_cached_list_fields(doctype: str, show_customer_portal_fields, build):
+    """
+    Returns (fields, version) of the list view field projection of `doctype`.
+    `build()` is only called when metadata changed since it was last cached;
+    `version` is a hash of the projection that clients can send back to skip it.
+    """
+    key = "list_fields::{0}::{1}::{2}".format(
+        doctype,
+        get_meta_version(doctype),
+        int(bool(show_customer_portal_fields)),
+    )
+    cached = frappe.cache().get_value(key)
+    if cached is not None:
+        return cached["fields"], cached["version"]
+
+    fields = build()
+    version = hashlib.sha256(frappe.as_json(fields).encode()).hexdigest()[:16]
+    frappe.cache().set_value(
+        key, {"fields": fields, "version": version}, expires_in_sec=LIST_FIELDS_CACHE_TTL
+    )
+    return fields, version
+
+
+def get_meta_version(doctype: str) -> str:
+    return frappe.cache().get_value(f"list_fields_version::{doctype}") or "0"
+
+
+def clear_list_fields_cache(doctype: str):
+    frappe.cache().set_value(
+        f"list_fields_version::{doctype}", frappe.generate_hash(length=10)
+    )
+
+
+def get_response_cache_ttl() -> int:
+    """Opt-in per site with `list_response_cache_ttl` (seconds) in site_config."""
+    return cint(frappe.conf.get("list_response_cache_ttl"))
+
+
+def cache_list_response(fn):
+    """
+    Caches `get_list_data` payloads per (permission scope, arguments) in Redis,
+    for the doctypes in CACHED_LIST_DOCTYPES only.
+
+    Entries are dropped when a ticket they contain is updated or deleted, and all
+    entries of a doctype are dropped when a new record is inserted. A ticket that
+    starts matching a cached list without being in it can not be detected, so
+    such hits are served until the TTL runs out and counted as `stale_served`.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(doctype, *args, **kwargs):
+        ttl = get_response_cache_ttl()
+        if not ttl or args or doctype not in CACHED_LIST_DOCTYPES:
+            return fn(doctype, *args, **kwargs)
+
+        arguments = json.dumps(kwargs, sort_keys=True, default=str)
+        # `@me` filters and the default view's columns are resolved per user
+        # inside `fn`
+        if "@me" in arguments or sbool(kwargs.get("is_default")):
+            scope = frappe.session.user
+        else:
+            scope = get_permission_scope(doctype)
+        key = "list_response::{0}::{1}::{2}::{3}".format(
+            doctype,
+            get_response_generation(doctype),
+            scope,
+            hashlib.sha256(arguments.encode()).hexdigest(),
+        )
+        cached = frappe.cache().get_value(key)
+        if cached is not None:
+            last_change = frappe.cache().get_value(f"list_response_changed::{doctype}")
+            if last_change and last_change > cached["cached_at"]:
+                incr_response_stat(doctype, "stale_served")
+            incr_response_stat(doctype, "hits")
+            return cached["payload"]
+
+        incr_response_stat(doctype, "misses")
+        payload = fn(doctype, **kwargs)
+        frappe.cache().set_value(
+            key, {"payload": payload, "cached_at": time.time()}, expires_in_sec=ttl
+        )
+        index_response_rows(doctype, key, payload.get("data") or [], ttl)
+        return payload
+
+    return wrapper
+
+
+def index_response_rows(doctype: str, key: str, rows: list, ttl: int):
+    """Remember which cached responses contain which records, for purging."""
+    cache = frappe.cache()
+    pipe = cache.pipeline()
+    for row in rows:
+        if not row.get("name"):
+            continue
+        row_key = cache.make_key(f"list_response_rows::{doctype}::{row.get('name')}")
+        pipe.sadd(row_key, key)
+        pipe.expire(row_key, ttl)
+    pipe.execute()
+
+
+def get_response_generation(doctype: str) -> str:
+    return frappe.cache().get_value(f"list_response_generation::{doctype}") or "0"
+
+
+def purge_response_rows(doctype: str, name):
+    cache = frappe.cache()
+    row_key = f"list_response_rows::{doctype}::{name}"
+    keys = [k.decode() if isinstance(k, bytes) else k for k in cache.smembers(row_key) or []]
+    if keys:
+        cache.delete_value(keys)
+    cache.delete_value(row_key)
+    cache.set_value(f"list_response_changed::{doctype}", time.time())
+
+
+def incr_response_stat(doctype: str, stat: str):
+    cache = frappe.cache()
+    cache.incrby(cache.make_key(f"list_response_stats::{doctype}::{stat}"), 1)
+
+
+def get_response_stats(doctype: str) -> dict:
+    cache = frappe.cache()
+    stats = {
+        stat: cint(cache.get(cache.make_key(f"list_response_stats::{doctype}::{stat}")))
+        for stat in ("hits", "misses", "stale_served")
+    }
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0
+    return stats
+
+
+@frappe.whitelist()
+def get_list_response_cache_stats(doctype: str = "HD Ticket"):
+    frappe.only_for("System Manager")
+    return {"enabled": bool(get_response_cache_ttl()), **get_response_stats(doctype)}
+
+
+def clear_response_cache(doctype: str):
+    """Drop every cached list of `doctype` by moving to a new generation."""
+    if not get_response_cache_ttl():
+        return
+    frappe.cache().set_value(
+        f"list_response_generation::{doctype}", frappe.generate_hash(length=10)
+    )
+
+
+def purge_ticket_responses(names):
+    """For ticket writes that skip `on_update`, e.g. `_assign` via db.set_value."""
+    if not get_response_cache_ttl():
+        return
+    for name in names:
+        purge_response_rows("HD Ticket", name)
+
+
+def on_ticket_insert_for_responses(doc, method=None):
+    """A new record may belong to any cached list (`helpdesk:new-ticket`)."""
+    clear_response_cache(doc.doctype)
+
+
+def on_ticket_change_for_responses(doc, method=None):
+    """Drop cached lists showing this record (`helpdesk:ticket-update`)."""
+    if not get_response_cache_ttl():
+        return
+    purge_response_rows(doc.doctype, doc.name)
@@ -0,0 +1,157 @@
+import csv
+import os
+
+import frappe
+from frappe import _
+from frappe.model import optional_fields
+from frappe.permissions import can_export
+from frappe.utils import cint
+
+from helpdesk.api.doc import (
+    add_assigned_to_full_name,
+    handle_at_me_support,
+    iter_list_rows,
+)
+from test_app.list_cache import get_total_count
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ("CSV", "Excel")
+
+
+@frappe.whitelist()
+def export_list_view(
+    doctype: str = "HD Ticket",
+    view=None,
+    filters=None,
+    order_by=None,
+    columns=None,
+    file_format="CSV",
+):
+    """
+    Queue an export of every row of a list view. Filters, columns and order_by
+    are taken from the HD View `view` unless passed explicitly. Progress and the
+    resulting file are published to the user on `test_app:list-export`.
+    """
+    can_export(doctype, raise_exception=True)
+    if file_format not in EXPORT_FORMATS:
+        frappe.throw(_("Unsupported export format: {0}").format(file_format))
+
+    if view:
+        saved = frappe.get_value(
+            "HD View", view, ["dt", "filters", "order_by", "columns"], as_dict=True
+        )
+        if not saved or saved.dt != doctype:
+            frappe.throw(_("View not found"), frappe.DoesNotExistError)
+        filters = filters or saved.filters
+        order_by = order_by or saved.order_by
+        columns = columns or saved.columns
+
+    job = frappe.enqueue(
+        "test_app.list_export.run_export",
+        queue="long",
+        timeout=60 * 60,
+        doctype=doctype,
+        filters=frappe.parse_json(filters or "{}"),
+        order_by=order_by or "modified desc",
+        columns=frappe.parse_json(columns or "[]"),
+        file_format=file_format,
+    )
+    return {"job_id": job.id if job else None}
+
+
+def run_export(doctype, filters, order_by, columns, file_format="CSV"):
+    """Background job: stream the list view into a private File, chunk by chunk."""
+    filters = handle_at_me_support(filters)
+    columns = get_export_columns(doctype, columns)
+    fields = [c["key"] for c in columns if c["key"] != "assigned_to_full_name"]
+    if "name" not in fields:
+        fields.append("name")
+    if doctype == "HD Ticket":
+        fields.append("custom_primary_assignee_full_name")
+
+    total, _is_estimated = get_total_count(doctype, filters)
+    extension = "csv" if file_format == "CSV" else "xlsx"
+    file_name = "{0}-{1}.{2}".format(
+        frappe.scrub(doctype), frappe.generate_hash(length=8), extension
+    )
+    path = frappe.get_site_path("private", "files", file_name)
+
+    def rows():
+        done = 0
+        for chunk in iter_list_rows(
+            doctype, fields, filters, order_by, chunk_size=EXPORT_CHUNK_SIZE
+        ):
+            if doctype == "HD Ticket":
+                chunk = add_assigned_to_full_name(chunk)
+            for row in chunk:
+                yield [row.get(c["key"]) for c in columns]
+            done += len(chunk)
+            publish_export_progress(file_name, done, total)
+
+    header = [c.get("label") or c["key"] for c in columns]
+    if file_format == "CSV":
+        write_csv(path, header, rows())
+    else:
+        write_xlsx(path, header, rows(), sheet_name=doctype)
+
+    file_doc = frappe.get_doc(
+        {
+            "doctype": "File",
+            "file_name": file_name,
+            "file_url": f"/private/files/{file_name}",
+            "is_private": 1,
+            "file_size": os.path.getsize(path),
+        }
+    ).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    frappe.publish_realtime(
+        "test_app:list-export",
+        {"file_name": file_name, "file_url": file_doc.file_url, "done": True},
+        user=frappe.session.user,
+    )
+
+
+def get_export_columns(doctype, columns):
+    """Keep view columns that map to real columns (or the assignee full name)."""
+    meta = frappe.get_meta(doctype)
+    valid_columns = set(meta.get_valid_columns()) | set(optional_fields)
+    valid_columns.add("assigned_to_full_name")
+
+    columns = [c for c in columns or [] if c.get("key") in valid_columns]
+    if not columns:
+        columns = [{"label": "Name", "key": "name"}]
+    return columns
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+
+
+def write_xlsx(path, header, rows, sheet_name="Sheet1"):
+    from openpyxl import Workbook
+
+    # write-only workbooks flush rows to disk instead of keeping them around
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name[:31])
+    ws.append(header)
+    for row in rows:
+        ws.append(["" if value is None else value for value in row])
+    wb.save(path)
+
+
+def publish_export_progress(file_name, done, total):
+    frappe.publish_realtime(
+        "test_app:list-export",
+        {
+            "file_name": file_name,
+            "done": False,
+            "progress": done,
+            "total": max(cint(total), done),
+        },
+        user=frappe.session.user,
+    )
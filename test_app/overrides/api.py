@@ -1,14 +1,14 @@
+import hashlib
 import json
 
 import frappe
 from bs4 import BeautifulSoup
 from frappe import _
 from frappe.model.document import get_controller
-from frappe.utils import get_user_info_for_avatar, now_datetime
-from frappe.utils.caching import redis_cache
+from frappe.utils import cint, now_datetime, sbool
 from pypika import Criterion, Order
 
-from helpdesk.api.doc import handle_at_me_support
+from helpdesk.api.doc import handle_at_me_support, make_cursor, parse_cursor
 from helpdesk.consts import DEFAULT_TICKET_TEMPLATE
 from helpdesk.helpdesk.doctype.hd_form_script.hd_form_script import get_form_script
 from helpdesk.helpdesk.doctype.hd_ticket_template.api import get_fields_meta
@@ -20,6 +20,17 @@ from helpdesk.utils import (
     is_agent,
     parse_call_logs,
 )
+from test_app.customer_cache import get_customer_projection
+from test_app.permissions import filter_permitted_tickets
+from test_app.thread import make_preview
+from test_app.timeline import get_timeline_query
+from test_app.ticket_cache import (
+    get_attachments,
+    get_attachments_map,
+    get_cached_ticket_meta,
+    get_call_logs_map,
+    get_user_info_map,
+)
 
 
 @frappe.whitelist()
@@ -32,9 +43,45 @@ def new(doc, attachments=[]):
     return d
 
 
+# Sections of `get_one` besides the ticket itself and its contact
+TICKET_SECTIONS = (
+    "comments",
+    "communications",
+    "history",
+    "views",
+    "tags",
+    "template",
+    "_form_script",
+    "fields",
+    "calls",
+)
+# Sections cached per template by `get_ticket_meta`
+TICKET_META_SECTIONS = ("template", "_form_script", "fields")
+# Sections that can be paged with `get_ticket_section`
+TIMELINE_SECTIONS = ("comments", "communications", "history", "views")
+TIMELINE_PAGE_LENGTH = 20
+
+
 @frappe.whitelist()
-def get_one(name, is_customer_portal=False):
+def get_one(
+    name, is_customer_portal=False, sections=None, if_version=None, meta_version=None
+):
+    """
+    Ticket with its contact and the requested `sections` (all of them by
+    default). Pass `sections=[]` to render the header from the core query only
+    and load the rest with `get_ticket_section`.
+
+    The payload carries a `_version` token; send it back as `if_version` to get
+    `{"not_modified": True}` instead while the ticket is unchanged. Likewise
+    template, form script and fields are left out when `meta_version` matches
+    the returned `_meta_version`.
+    """
     check_permissions("HD Ticket", None, doc=name)
+    sections = parse_sections(sections)
+    version = get_ticket_version(name)
+    if if_version and if_version == version:
+        return {"not_modified": True, "_version": version}
+
     QBContact = frappe.qb.DocType("Contact")
     QBTicket = frappe.qb.DocType("HD Ticket")
 
@@ -56,26 +103,10 @@ def get_one(name, is_customer_portal=False):
     ticket = ticket.pop()
 
     # ========== POPULATE VIRTUAL FIELDS FROM HD CUSTOMER ==========
-    if ticket.get("custom_customer_name"):
-        try:
-            customer = frappe.get_doc("HD Customer", ticket["custom_customer_name"])
-            
-            # Add virtual field values to ticket dictionary
-            ticket["custom_customercode"] = getattr(customer, "custom_customercode", "") or ""
-            ticket["custom_product"] = getattr(customer, "custom_productname", "") or ""
-            
-        except Exception as e:
-            frappe.log_error(
-                f"Error fetching virtual fields for ticket {name}: {str(e)}",
-                "Virtual Field Population Error"
-            )
-            # Set empty values if error occurs
-            ticket["custom_customercode"] = ""
-            ticket["custom_product"] = ""
-    else:
-        # If no customer is set, initialize empty values
-        ticket["custom_customercode"] = ""
-        ticket["custom_product"] = ""
+    customer = get_customer_projection(ticket.get("custom_customer_name")) or {}
+    ticket["custom_customercode"] = customer.get("customercode", "")
+    ticket["custom_product"] = customer.get("product", "")
+    ticket["custom_customer_alert"] = customer.get("has_alert", False)
     # ========== END OF VIRTUAL FIELDS SECTION ==========
 
     contact = (
@@ -100,51 +131,277 @@ def get_one(name, is_customer_portal=False):
         }
     template = ticket.template or DEFAULT_TICKET_TEMPLATE
 
-    linked_calls = frappe.db.get_all(
-        "Dynamic Link",
-        filters={"link_name": ticket["name"], "parenttype": "TP Call Log"},
-        pluck="parent",
-    )
-
-    calls = []
-
-    for call in linked_calls:
-        call = frappe.get_cached_doc(
-            "TP Call Log",
-            call,
-            fields=[
-                "name",
-                "caller",
-                "receiver",
-                "duration",
-                "type",
-                "status",
-                "from",
-                "to",
-                "recording_url",
-                "creation",
-            ],
-        ).as_dict()
-
-        calls.append(call)
-
-    call_logs = parse_call_logs(calls)
-
-    return {
-        **ticket,
-        "comments": get_comments(name),
-        "communications": get_communications(name),
-        "history": get_history(name),
-        "views": get_views(name),
-        "contact": contact,
-        "tags": get_tags(name),
-        "template": get_template(template),
-        "_form_script": get_form_script(
-            "HD Ticket", is_customer_portal=is_customer_portal
-        ),
-        "fields": get_meta(template),
-        "calls": call_logs,
+    timeline = {
+        section: TIMELINE_GETTERS[section](name, hydrate=False)
+        for section in TIMELINE_SECTIONS
+        if section in sections
     }
+    hydrate_timeline(
+        timeline.get("communications", ()),
+        timeline.get("comments", ()),
+        timeline.get("history", ()),
+        timeline.get("views", ()),
+    )
+
+    res = {**ticket, **timeline, "contact": contact}
+    if "tags" in sections:
+        res["tags"] = get_tags(name)
+    meta_sections = sections.intersection(TICKET_META_SECTIONS)
+    if meta_sections:
+        meta, res["_meta_version"] = get_ticket_meta(template, is_customer_portal)
+        if meta_version != res["_meta_version"]:
+            res.update({section: meta[section] for section in meta_sections})
+    if "calls" in sections:
+        res["calls"] = get_call_logs(ticket["name"])
+    res["_version"] = version
+    return res
+
+
+def get_ticket_version(ticket: str) -> str:
+    """
+    Token that changes whenever the ticket or its comments, emails, activities,
+    tags, views or calls are modified, added or removed. Computed with one
+    query of indexed lookups per table.
+    """
+    row = frappe.db.sql(
+        """
+        select
+            (select modified from `tabHD Ticket` where name = %(ticket)s),
+            (select concat(count(*), ':', coalesce(max(modified), ''))
+                from `tabHD Ticket Comment` where reference_ticket = %(ticket)s),
+            (select concat(count(*), ':', coalesce(max(modified), ''))
+                from `tabCommunication`
+                where reference_doctype = 'HD Ticket' and reference_name = %(ticket)s),
+            (select concat(count(*), ':', coalesce(max(modified), ''))
+                from `tabHD Ticket Activity` where ticket = %(ticket)s),
+            (select concat(count(*), ':', coalesce(max(modified), ''))
+                from `tabTag Link`
+                where document_type = 'HD Ticket' and document_name = %(ticket)s),
+            (select concat(count(*), ':', coalesce(max(modified), ''))
+                from `tabHD Ticket View State` where ticket = %(ticket)s),
+            (select concat(count(*), ':', coalesce(max(call_log.modified), ''))
+                from `tabDynamic Link` ticket_link
+                join `tabTP Call Log` call_log on call_log.name = ticket_link.parent
+                where ticket_link.parenttype = 'TP Call Log'
+                    and ticket_link.link_doctype = 'HD Ticket'
+                    and ticket_link.link_name = %(ticket)s)
+        """,
+        {"ticket": str(ticket)},
+    )[0]
+    return hashlib.sha256("|".join(map(str, row)).encode()).hexdigest()[:16]
+
+
+def parse_sections(sections) -> set:
+    """`sections` as a set; accepts a list, a JSON list or a comma separated string."""
+    if sections is None:
+        return set(TICKET_SECTIONS)
+    if isinstance(sections, str):
+        sections = (
+            frappe.parse_json(sections)
+            if sections.strip().startswith("[")
+            else sections.split(",")
+        )
+    sections = {s.strip() for s in sections or [] if s and s.strip()}
+    invalid = sections - set(TICKET_SECTIONS)
+    if invalid:
+        frappe.throw(
+            _("Invalid ticket sections: {0}").format(", ".join(sorted(invalid))),
+            frappe.ValidationError,
+        )
+    return sections
+
+
+@frappe.whitelist()
+def get_ticket_section(
+    ticket: str, section: str, cursor=None, page_length=TIMELINE_PAGE_LENGTH
+):
+    """
+    One page of a timeline section of `ticket`, in the same order as `get_one`.
+    Returns {"data": rows, "next_cursor": cursor of the next page or None}.
+    """
+    if section not in TIMELINE_SECTIONS:
+        frappe.throw(_("Invalid ticket section: {0}").format(section))
+    check_ticket_access(ticket)
+
+    page_length = max(cint(page_length), 1)
+    cursor = parse_timeline_cursor(cursor, section)
+    rows = TIMELINE_GETTERS[section](
+        ticket, hydrate=False, cursor=cursor, limit=page_length + 1
+    )
+    rows, next_cursor = get_next_page(rows, page_length, section)
+    hydrate_timeline(**{section: rows})
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+def check_ticket_access(ticket: str):
+    """Same access rules as `get_one`: read permission, customers see their own."""
+    check_permissions("HD Ticket", None, doc=ticket)
+    if is_agent():
+        return
+    QBTicket = frappe.qb.DocType("HD Ticket")
+    visible = (
+        frappe.qb.from_(QBTicket)
+        .select(QBTicket.name)
+        .where(QBTicket.name == ticket)
+        .where(get_customer_criteria())
+        .run()
+    )
+    if not visible:
+        frappe.throw(_("Ticket not found"), frappe.DoesNotExistError)
+
+
+def parse_timeline_cursor(cursor, section: str):
+    if not cursor:
+        return None
+    cursor = parse_cursor(cursor)
+    if cursor.get("order_by") != section or len(cursor["values"]) != 2:
+        frappe.throw(_("Invalid list cursor"), frappe.ValidationError)
+    return cursor
+
+
+def get_next_page(rows, page_length: int, section: str, fieldname="creation"):
+    """Trim the look-ahead row of `rows`; returns (rows, next_cursor)."""
+    if len(rows) <= page_length:
+        return rows, None
+    rows = rows[:page_length]
+    sort_keys = [(fieldname, None), ("name", None)]
+    return rows, make_cursor(section, sort_keys, rows[-1], 0)
+
+
+@frappe.whitelist()
+def get_ticket_timeline(ticket: str, cursor=None, page_length=TIMELINE_PAGE_LENGTH):
+    """
+    Merged feed of comments, emails, history, views and calls of `ticket`,
+    newest first, from the timeline table. Each event points to its record
+    with `reference_doctype`/`reference_name`.
+    Returns {"data": events, "next_cursor": cursor of the next page or None}.
+    """
+    check_ticket_access(ticket)
+    page_length = max(cint(page_length), 1)
+    cursor = parse_timeline_cursor(cursor, "timeline")
+
+    event_types = {"communication", "view", "call"}
+    if frappe.has_permission("HD Ticket Comment", "read"):
+        event_types.add("comment")
+    if frappe.has_permission("HD Ticket Activity", "read"):
+        event_types.add("history")
+
+    query, Event = get_timeline_query(ticket, event_types)
+    rows = page_timeline_query(
+        query, Event, Order.desc, cursor, page_length + 1, fieldname="timestamp"
+    ).run(as_dict=True)
+    rows, next_cursor = get_next_page(rows, page_length, "timeline", "timestamp")
+    add_user_info((rows, "actor"))
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+@frappe.whitelist()
+def get_thread(ticket: str, cursor=None, page_length=TIMELINE_PAGE_LENGTH):
+    """
+    Emails of `ticket`, newest first, with a plain-text `preview` instead of
+    the body. Fetch full bodies with `get_message`.
+    Returns {"data": rows, "next_cursor": cursor of the next page or None}.
+    """
+    check_ticket_access(ticket)
+    page_length = max(cint(page_length), 1)
+    cursor = parse_timeline_cursor(cursor, "thread")
+
+    QBCommunication = frappe.qb.DocType("Communication")
+    query = (
+        frappe.qb.from_(QBCommunication)
+        .select(
+            QBCommunication.bcc,
+            QBCommunication.cc,
+            QBCommunication.creation,
+            QBCommunication.communication_date,
+            QBCommunication.name,
+            QBCommunication.sender,
+            QBCommunication.recipients,
+            QBCommunication.subject,
+            QBCommunication.delivery_status,
+            QBCommunication.custom_preview.as_("preview"),
+        )
+        .where(QBCommunication.reference_doctype == "HD Ticket")
+        .where(QBCommunication.reference_name == ticket)
+    )
+    rows = page_timeline_query(
+        query, QBCommunication, Order.desc, cursor, page_length + 1
+    ).run(as_dict=True)
+    rows, next_cursor = get_next_page(rows, page_length, "thread")
+
+    # emails written before previews were stored
+    pending = [r.name for r in rows if r.preview is None]
+    if pending:
+        contents = dict(
+            frappe.get_all(
+                "Communication",
+                filters={"name": ["in", pending]},
+                fields=["name", "content"],
+                as_list=True,
+            )
+        )
+        for r in rows:
+            if r.name in contents:
+                r.preview = make_preview(contents[r.name])
+
+    hydrate_timeline(communications=rows)
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+@frappe.whitelist()
+def get_message(name: str):
+    """Full body of one ticket email listed by `get_thread`."""
+    message = frappe.db.get_value(
+        "Communication",
+        name,
+        ["name", "content", "reference_doctype", "reference_name"],
+        as_dict=True,
+    )
+    if not message or message.reference_doctype != "HD Ticket":
+        frappe.throw(_("Message not found"), frappe.DoesNotExistError)
+    check_ticket_access(message.reference_name)
+    return {"name": message.name, "content": message.content}
+
+
+def page_timeline_query(
+    query, table, order, cursor=None, limit=None, fieldname="creation"
+):
+    """
+    Order `query` on (`fieldname`, name) and seek past the row `cursor` points
+    to. `cursor` is a parsed cursor whose values are [value, name].
+    """
+    column = table[fieldname]
+    if cursor:
+        value, name = cursor["values"]
+        if order == Order.asc:
+            query = query.where(
+                (column > value) | ((column == value) & (table.name > name))
+            )
+        else:
+            query = query.where(
+                (column < value) | ((column == value) & (table.name < name))
+            )
+    query = query.orderby(column, order=order).orderby(table.name, order=order)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def get_ticket_meta(template: str, is_customer_portal=False):
+    """Returns (meta, version) of the ticket form, see `get_cached_ticket_meta`."""
+
+    is_customer_portal = bool(sbool(is_customer_portal))
+
+    def build():
+        return {
+            "template": get_template(template),
+            "_form_script": get_form_script(
+                "HD Ticket", is_customer_portal=is_customer_portal
+            ),
+            "fields": get_meta(template),
+        }
+
+    return get_cached_ticket_meta(template, is_customer_portal, build)
 
 
 def get_meta(template: str):
@@ -183,10 +440,11 @@ def get_assignee(_assign: str):
     j = frappe.parse_json(_assign)
     if not j or len(j) < 1:
         return
-    return get_user_info_for_avatar(j.pop())
+    user = j.pop()
+    return get_user_info_map([user]).get(user)
 
 
-def get_communications(ticket: str):
+def get_communications(ticket: str, hydrate=True, cursor=None, limit=None):
     QBCommunication = frappe.qb.DocType("Communication")
     communications = (
         frappe.qb.from_(QBCommunication)
@@ -204,16 +462,16 @@ def get_communications(ticket: str):
         )
         .where(QBCommunication.reference_doctype == "HD Ticket")
         .where(QBCommunication.reference_name == ticket)
-        .orderby(QBCommunication.creation, order=Order.asc)
-        .run(as_dict=True)
     )
-    for c in communications:
-        c.attachments = get_attachments("Communication", c.name)
-        c.user = get_user_info_for_avatar(c.sender)
+    communications = page_timeline_query(
+        communications, QBCommunication, Order.asc, cursor, limit
+    ).run(as_dict=True)
+    if hydrate:
+        hydrate_timeline(communications=communications)
     return communications
 
 
-def get_comments(ticket: str):
+def get_comments(ticket: str, hydrate=True, cursor=None, limit=None):
     if not frappe.has_permission("HD Ticket Comment", "read"):
         return []
     QBComment = frappe.qb.DocType("HD Ticket Comment")
@@ -227,16 +485,48 @@ def get_comments(ticket: str):
             QBComment.name,
         )
         .where(QBComment.reference_ticket == ticket)
-        .orderby(QBComment.creation, order=Order.asc)
-        .run(as_dict=True)
     )
-    for c in comments:
-        c.user = get_user_info_for_avatar(c.commented_by)
-        c.attachments = get_attachments("HD Ticket Comment", c.name)
+    comments = page_timeline_query(comments, QBComment, Order.asc, cursor, limit).run(
+        as_dict=True
+    )
+    if hydrate:
+        hydrate_timeline(comments=comments)
     return comments
 
 
-def get_history(ticket: str):
+def hydrate_timeline(communications=(), comments=(), history=(), views=()):
+    """Resolve attachments and avatars of timeline rows in bulk."""
+    add_attachments(communications=communications, comments=comments)
+    add_user_info(
+        (communications, "sender"),
+        (comments, "commented_by"),
+        (history, "owner"),
+        (views, "viewed_by"),
+    )
+
+
+def add_attachments(communications=(), comments=()):
+    """Set `attachments` on timeline rows with a single File query."""
+    rows = [("Communication", c) for c in communications]
+    rows += [("HD Ticket Comment", c) for c in comments]
+    attachments = get_attachments_map((doctype, r.name) for doctype, r in rows)
+    for doctype, r in rows:
+        r.attachments = attachments.get((doctype, r.name), [])
+
+
+def add_user_info(*groups):
+    """
+    Set `user` avatar info on rows with a single lookup for every user involved.
+    `groups` are (rows, user_fieldname) pairs.
+    """
+    infos = get_user_info_map(r.get(field) for rows, field in groups for r in rows)
+    for rows, field in groups:
+        for r in rows:
+            user = r.get(field)
+            r.user = infos.get(user) or {"email": user, "image": "", "name": user}
+
+
+def get_history(ticket: str, hydrate=True, cursor=None, limit=None):
     if not frappe.has_permission("HD Ticket Activity", "read"):
         return []
     QBActivity = frappe.qb.DocType("HD Ticket Activity")
@@ -246,33 +536,44 @@ def get_history(ticket: str):
             QBActivity.name, QBActivity.action, QBActivity.owner, QBActivity.creation
         )
         .where(QBActivity.ticket == str(ticket))
-        .orderby(QBActivity.creation, order=Order.desc)
     )
+    history = page_timeline_query(history, QBActivity, Order.desc, cursor, limit)
     history = history.run(as_dict=True)
-    for h in history:
-        h.user = get_user_info_for_avatar(h.owner)
+    if hydrate:
+        hydrate_timeline(history=history)
     return history
 
 
-def get_views(ticket: str):
-    QBViewLog = frappe.qb.DocType("View Log")
+def get_views(ticket: str, hydrate=True, cursor=None, limit=None):
+    """One row per viewer, `creation` being the last time they opened the ticket."""
+    QBViewState = frappe.qb.DocType("HD Ticket View State")
     views = (
-        frappe.qb.from_(QBViewLog)
+        frappe.qb.from_(QBViewState)
         .select(
-            QBViewLog.creation,
-            QBViewLog.name,
-            QBViewLog.viewed_by,
+            QBViewState.last_seen.as_("creation"),
+            QBViewState.name,
+            QBViewState.user.as_("viewed_by"),
+            QBViewState.first_seen,
+            QBViewState.view_count,
         )
-        .where(QBViewLog.reference_doctype == "HD Ticket")
-        .where(QBViewLog.reference_name == ticket)
-        .orderby(QBViewLog.creation, order=Order.desc)
-        .run(as_dict=True)
+        .where(QBViewState.ticket == str(ticket))
     )
-    for v in views:
-        v.user = get_user_info_for_avatar(v.viewed_by)
+    views = page_timeline_query(
+        views, QBViewState, Order.desc, cursor, limit, fieldname="last_seen"
+    ).run(as_dict=True)
+    if hydrate:
+        hydrate_timeline(views=views)
     return views
 
 
+TIMELINE_GETTERS = {
+    "comments": get_comments,
+    "communications": get_communications,
+    "history": get_history,
+    "views": get_views,
+}
+
+
 def get_tags(ticket: str):
     QBTag = frappe.qb.DocType("Tag Link")
     rows = (
@@ -290,49 +591,14 @@ def get_tags(ticket: str):
 
 
 def get_call_logs(ticket: str):
-    linked_calls = frappe.db.get_all(
-        "Dynamic Link",
-        filters={"link_name": ticket, "parenttype": "TP Call Log"},
-        pluck="parent",
-    )
-
-    calls = []
-
-    for call in linked_calls:
-        call = frappe.get_cached_doc(
-            "TP Call Log",
-            call,
-            fields=[
-                "name",
-                "caller",
-                "receiver",
-                "duration",
-                "type",
-                "status",
-                "from",
-                "to",
-                "recording_url",
-                "creation",
-            ],
-        ).as_dict()
-
-        calls.append(call)
-
-    call_logs = parse_call_logs(calls)
-    return call_logs
-
-
-@redis_cache()
-def get_attachments(doctype, name):
-    QBFile = frappe.qb.DocType("File")
-
-    return (
-        frappe.qb.from_(QBFile)
-        .select(QBFile.name, QBFile.file_url, QBFile.file_name)
-        .where(QBFile.attached_to_doctype == doctype)
-        .where(QBFile.attached_to_name == name)
-        .run(as_dict=True)
-    )
+    calls = get_call_logs_map([ticket]).get(str(ticket), [])
+    return parse_call_logs(calls)
+
+
+def get_call_logs_batch(tickets) -> dict:
+    """Parsed call logs of many tickets, keyed by ticket, with one query."""
+    calls_map = get_call_logs_map(tickets)
+    return {ticket: parse_call_logs(calls) for ticket, calls in calls_map.items()}
 
 
 @frappe.whitelist()
@@ -778,18 +1044,31 @@ def get_similar_tickets(ticket: str):
         )
 
     tickets = [t for t in tickets if t["relevance"] > relevance_threshold]
+    permitted = set(filter_permitted_tickets(t["name"] for t in tickets))
+    tickets = [t for t in tickets if str(t["name"]) in permitted]
 
     return tickets
 
 
 @frappe.whitelist()
-def get_ticket_activities(ticket: str):
+def get_ticket_activities(ticket: str, if_version=None):
+    version = get_ticket_version(ticket)
+    if if_version and if_version == version:
+        return {"not_modified": True, "_version": version}
+
+    comments = get_comments(ticket, hydrate=False)
+    communications = get_communications(ticket, hydrate=False)
+    history = get_history(ticket, hydrate=False)
+    views = get_views(ticket, hydrate=False)
+    hydrate_timeline(communications, comments, history, views)
+
     activities = {
-        "comments": get_comments(ticket),
-        "communications": get_communications(ticket),
-        "history": get_history(ticket),
-        "views": get_views(ticket),
+        "comments": comments,
+        "communications": communications,
+        "history": history,
+        "views": views,
         "calls": get_call_logs(ticket),
+        "_version": version,
     }
     return activities
 
@@ -799,9 +1078,10 @@ def get_ticket_assignees(ticket: str):
     _assign = frappe.db.get_value("HD Ticket", ticket, "_assign") or "[]"
     user_ids = frappe.parse_json(_assign) or []
 
+    infos = get_user_info_map(user_ids)
     assignees = []
     for user_id in user_ids:
-        info = get_user_info_for_avatar(user_id) or {}
+        info = infos.get(user_id) or {}
         # info = {"name": "<Full Name>", "email": "<user@example.com>", "image": "..."}
         assignees.append(
             {
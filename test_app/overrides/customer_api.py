@@ -7,6 +7,8 @@ Will be copied to: helpdesk/api/customer_api.py
 import frappe
 from frappe import _
 
+from test_app.customer_cache import get_customer_projection
+
 
 @frappe.whitelist()
 def search_hd_customers(search_term):
@@ -78,6 +80,28 @@ def search_hd_customers(search_term):
         return []
 
 
+CUSTOMER_DETAIL_FIELDS = [
+    "name",
+    "customer_name",
+    "custom_sl_no",
+    "custom_customercode",
+    "custom_address1",
+    "custom_address2",
+    "custom_place",
+    "custom_district",
+    "custom_state",
+    "custom_country",
+    "custom_contactperson",
+    "custom_phone001",
+    "custom_phone002",
+    "custom_gstno",
+    "custom_email",
+    "custom_productname",
+    "custom_nooflicense",
+    "custom_dateofamclastpaid",
+]
+
+
 @frappe.whitelist()
 def get_hd_customer_details(customer_name):
     """
@@ -95,33 +119,18 @@ def get_hd_customer_details(customer_name):
         if not frappe.has_permission("HD Customer", "read", customer_name):
             frappe.throw(_("Insufficient permissions to access this customer"))
 
-        customer = frappe.get_doc("HD Customer", customer_name)
+        # Cached projection, rejects unknown and disabled customers without a query
+        projection = get_customer_projection(customer_name)
+        if not projection:
+            raise frappe.DoesNotExistError
 
         # Enforce only Enabled customers
-        if getattr(customer, "custom_status", None) != "Enabled":
+        if projection["status"] != "Enabled":
             frappe.throw(_("Customer is disabled and cannot be selected"))
 
-        return {
-            "name": customer.name,
-            "customer_name": customer.customer_name,
-            "custom_sl_no": getattr(customer, "custom_sl_no", None),
-            "custom_customercode": getattr(customer, "custom_customercode", None),
-            "custom_address1": getattr(customer, "custom_address1", None),
-            "custom_address2": getattr(customer, "custom_address2", None),
-            "custom_place": getattr(customer, "custom_place", None),
-            "custom_district": getattr(customer, "custom_district", None),
-            "custom_state": getattr(customer, "custom_state", None),
-            "custom_country": getattr(customer, "custom_country", None),
-            "custom_contactperson": getattr(customer, "custom_contactperson", None),
-            "custom_phone001": getattr(customer, "custom_phone001", None),
-            "custom_phone002": getattr(customer, "custom_phone002", None),
-            "custom_gstno": getattr(customer, "custom_gstno", None),
-            "custom_email": getattr(customer, "custom_email", None),
-            "custom_productname": getattr(customer, "custom_productname", None),
-            "custom_nooflicense": getattr(customer, "custom_nooflicense", None),
-            "custom_dateofamclastpaid": getattr(customer, "custom_dateofamclastpaid", None
-            ),
-        }
+        return frappe.db.get_value(
+            "HD Customer", customer_name, CUSTOMER_DETAIL_FIELDS, as_dict=True
+        )
 
     except frappe.DoesNotExistError:
         frappe.throw(_("Customer not found"))
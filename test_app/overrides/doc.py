@@ -1,9 +1,11 @@
+import base64
 import frappe
-import json
+import re
 from frappe import _
 from frappe.desk.form.assign_to import set_status
-from frappe.model import no_value_fields
+from frappe.model import no_value_fields, optional_fields
 from frappe.model.document import get_controller
+from frappe.utils import add_to_date, cint, get_datetime, make_filter_tuple
 from frappe.utils.caching import redis_cache
 from pypika import Criterion
 
@@ -13,80 +15,59 @@ from helpdesk.utils import (
     contact_default_columns,
     parse_call_logs,
 )
+from test_app.labels import get_labels
+from test_app.list_cache import (
+    cache_list_response,
+    get_cached_list_fields,
+    get_total_count,
+)
+from test_app.utils import get_primary_assignee
+
+FIELDNAME_PATTERN = re.compile(r"^[a-zA-Z0-9_]+$")
+# upper bound of groups returned by a grouped (group_page_length) list request
+MAX_GROUPS = 500
+# above this many changed rows a delta refresh asks the client to reload
+MAX_DELTA_ROWS = 200
+# rows modified this long before `since` are read again, so that transactions
+# still open when the previous delta was read are not missed
+DELTA_OVERLAP_SECONDS = 10
 
 def add_assigned_to_full_name(data: list[dict]) -> list[dict]:
-    """Add assigned_to_full_name to HD Ticket rows from _assign / User.full_name."""
+    """Add assigned_to_full_name to HD Ticket rows from the primary assignee columns."""
     if not data:
         return data
 
-    users = set()
-
-    # Collect first assignee per row
+    # Rows that were assigned before the primary assignee columns were
+    # maintained fall back to `_assign` / User.full_name
+    pending = {}
     for row in data:
-        assign_raw = row.get("_assign")
-        if not assign_raw:
+        full_name = row.get("custom_primary_assignee_full_name")
+        row["assigned_to_full_name"] = full_name or ""
+        if full_name:
             continue
+        first_user = get_primary_assignee(row.get("_assign"))
+        if first_user:
+            pending.setdefault(first_user, []).append(row)
 
-        if isinstance(assign_raw, str):
-            try:
-                assignees = json.loads(assign_raw)
-            except Exception:
-                assignees = []
-        elif isinstance(assign_raw, (list, tuple)):
-            assignees = list(assign_raw)
-        else:
-            assignees = []
-
-        if assignees:
-            first_user = assignees[0]
-            if isinstance(first_user, str):
-                users.add(first_user)
-
-    # If no assignees, still create the key for frontend
-    if not users:
-        for row in data:
-            row["assigned_to_full_name"] = ""
+    if not pending:
         return data
 
-    # Fetch full names in one query
-    fullnames = {}
-    for d in frappe.get_all(
-        "User",
-        filters={"name": ["in", list(users)]},
-        fields=["name", "full_name"],
-    ):
-        fullnames[d.name] = d.full_name or d.name
-
-    # Fallback via frappe.get_fullname
-    for u in users:
-        if u not in fullnames:
-            fullnames[u] = frappe.get_fullname(u)
-
-    # Set assigned_to_full_name per row
-    for row in data:
-        assign_raw = row.get("_assign")
-        full_name = ""
-        if assign_raw:
-            if isinstance(assign_raw, str):
-                try:
-                    assignees = json.loads(assign_raw)
-                except Exception:
-                    assignees = []
-            elif isinstance(assign_raw, (list, tuple)):
-                assignees = list(assign_raw)
-            else:
-                assignees = []
-
-            if assignees:
-                first_user = assignees[0]
-                if isinstance(first_user, str):
-                    full_name = fullnames.get(first_user, first_user)
-
-        row["assigned_to_full_name"] = full_name
+    fullnames = dict(
+        frappe.get_all(
+            "User",
+            filters={"name": ["in", list(pending)]},
+            fields=["name", "full_name"],
+            as_list=True,
+        )
+    )
+    for user, rows in pending.items():
+        for row in rows:
+            row["assigned_to_full_name"] = fullnames.get(user) or user
 
     return data
 
 @frappe.whitelist()
+@cache_list_response
 def get_list_data(
     doctype: str,
     # flake8: noqa
@@ -99,6 +80,10 @@ def get_list_data(
     show_customer_portal_fields=False,
     view=None,
     is_default=False,
+    cursor=None,
+    approximate_count=False,
+    group_page_length=None,
+    fields_version=None,
 ):
     is_custom = False
 
@@ -179,6 +164,9 @@ def get_list_data(
     if doctype == "HD Ticket" and "custom_remarks" not in rows:
         rows.append("custom_remarks")
 
+    if doctype == "HD Ticket" and "custom_primary_assignee_full_name" not in rows:
+        rows.append("custom_primary_assignee_full_name")
+
     if doctype == "HD Customer":
         if "customer_name" not in rows:
             rows.append("customer_name")
@@ -186,16 +174,35 @@ def get_list_data(
             rows.append("image")
 
     rows.append("name") if "name" not in rows else rows
-    data = (
-        frappe.get_list(
+
+    # keyset pagination: the order is made total by a trailing `name` so that
+    # the last row of a page identifies exactly where the next one starts
+    page_length = cint(page_length)
+    sort_keys = get_sort_keys(order_by)
+    for fieldname, _direction in sort_keys:
+        if fieldname not in rows:
+            rows.append(fieldname)
+    order_by = ", ".join(f"{fieldname} {direction}" for fieldname, direction in sort_keys)
+
+    groups = None
+    groups_truncated = False
+    next_cursor = None
+    if group_by_field and view_type == "group_by" and cint(group_page_length):
+        groups, data, groups_truncated = get_grouped_data(
             doctype,
-            fields=rows,
-            filters=filters,
-            order_by=order_by,
-            page_length=page_length,
+            filters,
+            rows,
+            order_by,
+            sort_keys,
+            group_by_field,
+            label_doc if label_doc else doctype,
+            label_field if label_field else group_by_field,
+            cint(group_page_length),
+        )
+    else:
+        data, next_cursor = get_list_page(
+            doctype, rows, filters, order_by, sort_keys, cursor, page_length
         )
-        or []
-    )
 
     if doctype == "TP Call Log":
         data = parse_call_logs(data)
@@ -210,56 +217,10 @@ def get_list_data(
         if "custom_customer_name" not in rows:
             rows.append("custom_customer_name")
             
-    fields = frappe.get_meta(doctype).fields
-    fields = [field for field in fields if field.fieldtype not in no_value_fields]
-    fields = [
-        {
-            "label": field.label,
-            "type": field.fieldtype,
-            "value": field.fieldname,
-            "options": field.options,
-        }
-        for field in fields
-        if field.label and field.fieldname
-    ]
-
-    std_fields = [
-        {"label": "Name", "type": "Data", "value": "name"},
-        {"label": "Created On", "type": "Datetime", "value": "creation"},
-        {"label": "Last Modified", "type": "Datetime", "value": "modified"},
-        {
-            "label": "Modified By",
-            "type": "Link",
-            "value": "modified_by",
-            "options": "User",
-        },
-        {"label": "Assigned To", "type": "Text", "value": "_assign"},
-        {"label": "Owner", "type": "Link", "value": "owner", "options": "User"},
-    ]
-
-    # NEW: expose logical field for full name in HD Ticket
-    if doctype == "HD Ticket":
-        std_fields.append(
-            {
-                "label": "Assigned To",
-                "type": "Data",
-                "value": "assigned_to_full_name",
-            }
-        )
-        std_fields.append({
-            "label": "Customer Name",
-            "type": "Data", 
-            "value": "custom_customer_name"
-        })
-
-    for field in std_fields:
+    fields, list_fields_version = get_list_fields(doctype, show_customer_portal_fields)
+    for field in get_std_list_fields(doctype):
         if field.get("value") not in rows:
             rows.append(field.get("value"))
-        if field not in fields:
-            fields.append(field)
-
-    if show_customer_portal_fields:
-        fields = get_customer_portal_fields(doctype, fields)
 
     if group_by_field and view_type == "group_by":
 
@@ -271,13 +232,14 @@ def get_list_data(
                 options = list(set([d.get(group_by_field) for d in data]))
                 options = [u for u in options if u]
                 options = [category_name for category_name in options if category_name]
+                labels = get_labels(
+                    label_doc if label_doc else doctype,
+                    options,
+                    label_field if label_field else group_by_field,
+                )
                 options = [
                     {
-                        "label": frappe.db.get_value(
-                            label_doc if label_doc else doctype,
-                            option,
-                            label_field if label_field else group_by_field,
-                        ),
+                        "label": labels.get(option),
                         "value": option,
                     }
                     for option in options
@@ -286,55 +248,518 @@ def get_list_data(
                 if has_empty_values:
                     options.append({"label": "", "value": ""})
 
-                if order_by and group_by_field in order_by:
-                    order_by_fields = order_by.split(",")
-                    order_by_fields = [
-                        (field.split(" ")[0], field.split(" ")[1])
-                        for field in order_by_fields
-                    ]
-                    if (group_by_field, "asc") in order_by_fields:
-                        options.sort(key=lambda x: x.get("label"))
-                    elif (group_by_field, "desc") in order_by_fields:
-                        options.sort(reverse=True, key=lambda x: x.get("label"))
-                else:
-                    options.sort(key=lambda x: x.get("label"))
-
-                # general category at first position
-                idx = [
-                    idx for idx, o in enumerate(options) if o.get("label") == "General"
-                ]
-                if len(idx) == 0:
-                    return options
-
-                idx = idx[0]
-                default_category = options[idx]
-                options.pop(idx)
-                options.insert(0, default_category)
-                return options
+                return sort_group_options(options, sort_keys, group_by_field)
 
         for field in fields:
             if field.get("value") == group_by_field:
-                options = get_options(field.get("type"), field.get("options"))
+                options = (
+                    groups
+                    if groups is not None
+                    else get_options(field.get("type"), field.get("options"))
+                )
                 group_by_field = {
                     "label": field.get("label"),
                     "name": field.get("value"),
                     "type": field.get("type"),
                     "options": options,
                 }
+    total_count, count_is_estimated = get_total_count(
+        doctype, filters, approximate=approximate_count
+    )
+
     return {
         "data": data,
         "columns": columns,
         "rows": rows,
-        "fields": fields if doctype == "HD Ticket" else [],
-        "total_count": frappe.get_list(
-            doctype, filters=filters, fields="count(*) as count"
-        )[0].count,
+        "fields": fields
+        if doctype == "HD Ticket" and fields_version != list_fields_version
+        else [],
+        "fields_version": list_fields_version,
+        "total_count": total_count,
+        "count_is_estimated": count_is_estimated,
         "row_count": len(data),
+        "next_cursor": next_cursor,
         "group_by_field": group_by_field,
+        "groups_truncated": groups_truncated,
         "view_type": view_type,
     }
 
 
+@frappe.whitelist()
+def get_list_delta(
+    doctype: str,
+    since: str,
+    names=None,
+    filters=None,
+    order_by: str = "modified desc",
+    rows=None,
+):
+    """
+    Changes to a list view since `since`, for polling clients that already show
+    the rows `names`.
+
+    Only rows modified after `since` are read, so the cost follows the churn and
+    not the page size. Returns rows that still match the view and were `changed`
+    (visible) or `inserted` (not visible yet, the client places them by
+    `order_by`), the visible names that were `removed` (deleted or no longer
+    matching), and `synced_at` to pass as `since` next time. When more than
+    MAX_DELTA_ROWS rows changed, `reload` is set and the client should refetch
+    the page with `get_list_data` instead.
+
+    `synced_at` comes from the database clock and each read goes back
+    DELTA_OVERLAP_SECONDS before `since`, so a row that was committed late is
+    picked up by the next delta. Rows of the overlap can be sent twice; the
+    client merges `changed` and `inserted` by name.
+    """
+    synced_at = frappe.db.sql("select now(6)")[0][0]
+    since = add_to_date(get_datetime(since), seconds=-DELTA_OVERLAP_SECONDS)
+    names = [str(name) for name in frappe.parse_json(names or "[]")]
+    filters = handle_at_me_support(frappe.parse_json(filters or "[]"))
+    sort_keys = get_sort_keys(order_by)
+    order_by = ", ".join(f"{fieldname} {direction}" for fieldname, direction in sort_keys)
+
+    meta = frappe.get_meta(doctype)
+    valid_columns = set(meta.get_valid_columns()) | set(optional_fields)
+    rows = [row for row in frappe.parse_json(rows or "[]") if row in valid_columns]
+    for fieldname in ["name", "modified", *[f for f, _direction in sort_keys]]:
+        if fieldname not in rows:
+            rows.append(fieldname)
+    if doctype == "HD Ticket" and "custom_primary_assignee_full_name" not in rows:
+        rows.append("custom_primary_assignee_full_name")
+
+    delta_filters = get_filter_list(doctype, filters)
+    delta_filters.append([doctype, "modified", ">", since])
+    data = frappe.get_list(
+        doctype,
+        fields=rows,
+        filters=delta_filters,
+        order_by=order_by,
+        limit=MAX_DELTA_ROWS + 1,
+    )
+    if len(data) > MAX_DELTA_ROWS:
+        return {"reload": True, "synced_at": synced_at}
+
+    if doctype == "TP Call Log":
+        data = parse_call_logs(data)
+    if doctype == "HD Ticket":
+        data = add_assigned_to_full_name(data)
+
+    visible = set(names)
+    matched = {str(row.name) for row in data}
+    removed = []
+    if names:
+        # visible rows that were deleted, or touched and no longer match
+        existing = frappe.get_all(
+            doctype,
+            filters={"name": ["in", names]},
+            fields=["name", "modified"],
+        )
+        existing_names = {str(row.name) for row in existing}
+        touched = {
+            str(row.name)
+            for row in existing
+            if get_datetime(row.modified) > since
+        }
+        removed = [
+            name
+            for name in names
+            if name not in existing_names or (name in touched and name not in matched)
+        ]
+
+    return {
+        "changed": [row for row in data if str(row.name) in visible],
+        "inserted": [row for row in data if str(row.name) not in visible],
+        "removed": removed,
+        "synced_at": synced_at,
+        "reload": False,
+    }
+
+
+def get_list_fields(doctype: str, show_customer_portal_fields=False):
+    """Returns (fields, version); rebuilt only when the doctype's metadata changes."""
+
+    def build():
+        fields = frappe.get_meta(doctype).fields
+        fields = [field for field in fields if field.fieldtype not in no_value_fields]
+        fields = [
+            {
+                "label": field.label,
+                "type": field.fieldtype,
+                "value": field.fieldname,
+                "options": field.options,
+            }
+            for field in fields
+            if field.label and field.fieldname
+        ]
+
+        for field in get_std_list_fields(doctype):
+            if field not in fields:
+                fields.append(field)
+
+        if show_customer_portal_fields:
+            fields = get_customer_portal_fields(doctype, fields)
+        return fields
+
+    return get_cached_list_fields(doctype, show_customer_portal_fields, build)
+
+
+def get_std_list_fields(doctype: str) -> list[dict]:
+    std_fields = [
+        {"label": "Name", "type": "Data", "value": "name"},
+        {"label": "Created On", "type": "Datetime", "value": "creation"},
+        {"label": "Last Modified", "type": "Datetime", "value": "modified"},
+        {
+            "label": "Modified By",
+            "type": "Link",
+            "value": "modified_by",
+            "options": "User",
+        },
+        {"label": "Assigned To", "type": "Text", "value": "_assign"},
+        {"label": "Owner", "type": "Link", "value": "owner", "options": "User"},
+    ]
+
+    # NEW: expose logical field for full name in HD Ticket
+    if doctype == "HD Ticket":
+        std_fields.append(
+            {
+                "label": "Assigned To",
+                "type": "Data",
+                "value": "assigned_to_full_name",
+            }
+        )
+        std_fields.append({
+            "label": "Customer Name",
+            "type": "Data", 
+            "value": "custom_customer_name"
+        })
+    return std_fields
+
+
+def get_sort_keys(order_by: str) -> list[tuple[str, str]]:
+    """Parse `order_by` into (fieldname, direction) pairs ending with `name`."""
+    sort_keys = []
+    for part in (order_by or "modified desc").split(","):
+        tokens = part.strip().split()
+        if not tokens:
+            continue
+        fieldname = tokens[0].replace("`", "").split(".")[-1]
+        validate_fieldname(fieldname)
+        direction = "desc" if len(tokens) > 1 and tokens[1].lower() == "desc" else "asc"
+        sort_keys.append((fieldname, direction))
+
+    if not sort_keys:
+        sort_keys.append(("modified", "desc"))
+    if "name" not in [fieldname for fieldname, _direction in sort_keys]:
+        sort_keys.append(("name", sort_keys[0][1]))
+    return sort_keys
+
+
+def validate_fieldname(fieldname: str):
+    # these names end up as identifiers in raw SQL (keyset / group ranking)
+    if not FIELDNAME_PATTERN.match(fieldname or ""):
+        frappe.throw(_("Invalid field name: {0}").format(fieldname), frappe.ValidationError)
+
+
+def make_cursor(order_by: str, sort_keys: list, last_row: dict, start: int) -> str:
+    """Opaque cursor pointing right after `last_row` in the given order."""
+    payload = {
+        "order_by": order_by,
+        "values": [last_row.get(fieldname) for fieldname, _direction in sort_keys],
+        "start": start,
+    }
+    return base64.urlsafe_b64encode(
+        frappe.as_json(payload, indent=None).encode()
+    ).decode()
+
+
+def parse_cursor(cursor: str) -> dict:
+    try:
+        payload = frappe.parse_json(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        payload = None
+    if not isinstance(payload, dict) or not isinstance(payload.get("values"), list):
+        frappe.throw(_("Invalid list cursor"), frappe.ValidationError)
+    return payload
+
+
+def get_filter_list(doctype, filters) -> list:
+    """Copy of `filters` in list form, so that more conditions can be appended."""
+    if isinstance(filters, dict):
+        return [make_filter_tuple(doctype, key, value) for key, value in filters.items()]
+    return list(filters or [])
+
+
+def get_cursor_condition(order_by, sort_keys, cursor) -> str:
+    """
+    WHERE fragment selecting the rows that follow `cursor` in `sort_keys` order:
+    `(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...`, ending with the `name`
+    tie-breaker. Empty (null) values sort first, as in MariaDB, so they are
+    matched explicitly. Every page is a seek, however deep the client scrolls.
+    """
+    payload = parse_cursor(cursor)
+    if payload.get("order_by") != order_by:
+        frappe.throw(
+            _("List cursor does not match the current sort order"),
+            frappe.ValidationError,
+        )
+    values = payload["values"]
+    if len(values) != len(sort_keys):
+        frappe.throw(_("Invalid list cursor"), frappe.ValidationError)
+
+    branches = []
+    for idx, ((fieldname, direction), value) in enumerate(zip(sort_keys, values)):
+        after = get_after_condition(f"matched.`{fieldname}`", direction, value)
+        if after is None:
+            continue
+        equal = [
+            get_equal_condition(f"matched.`{prev_fieldname}`", prev_value)
+            for (prev_fieldname, _direction), prev_value in zip(sort_keys[:idx], values[:idx])
+        ]
+        branches.append("({0})".format(" and ".join([*equal, after])))
+    return " or ".join(branches) if branches else "1 = 0"
+
+
+def get_after_condition(column: str, direction: str, value) -> str | None:
+    """Rows of `column` strictly after `value`, None when there can be none."""
+    if value is None:
+        return f"{column} is not null" if direction == "asc" else None
+    if direction == "asc":
+        return f"{column} > {frappe.db.escape(value)}"
+    return f"({column} < {frappe.db.escape(value)} or {column} is null)"
+
+
+def get_equal_condition(column: str, value) -> str:
+    if value is None:
+        return f"{column} is null"
+    return f"{column} = {frappe.db.escape(value)}"
+
+
+def get_list_page(doctype, fields, filters, order_by, sort_keys, cursor, page_length):
+    """
+    Returns (data, next_cursor) for the `page_length` rows that follow `cursor`.
+    Pages after the first select from the permitted `get_list` query with the
+    keyset condition of `get_cursor_condition`. `next_cursor` also carries the
+    running position, the number of rows returned so far.
+    """
+    # the cursor is made of the sort values of the last row
+    fields = [*fields, *[f for f, _direction in sort_keys if f not in fields]]
+    if not cursor:
+        position = 0
+        data = (
+            frappe.get_list(
+                doctype,
+                fields=fields,
+                filters=filters,
+                order_by=order_by,
+                page_length=page_length,
+            )
+            or []
+        )
+    else:
+        condition = get_cursor_condition(order_by, sort_keys, cursor)
+        position = cint(parse_cursor(cursor).get("start"))
+        base_query = frappe.get_list(
+            doctype,
+            fields=fields,
+            filters=filters,
+            order_by=order_by,
+            limit_page_length=0,
+            run=0,
+        )
+        ordering = ", ".join(
+            f"matched.`{fieldname}` {direction}" for fieldname, direction in sort_keys
+        )
+        limit = f"limit {cint(page_length)}" if page_length else ""
+        # no query values: the permitted query may contain literal `%`
+        data = frappe.db.sql(
+            f"""
+            select * from ({base_query}) as matched
+            where {condition}
+            order by {ordering}
+            {limit}
+            """,
+            as_dict=True,
+        )
+
+    next_cursor = None
+    if page_length and len(data) == page_length:
+        next_cursor = make_cursor(order_by, sort_keys, data[-1], position + len(data))
+    return data, next_cursor
+
+
+def iter_list_rows(doctype, fields, filters, order_by, chunk_size=1000):
+    """
+    Yields lists of at most `chunk_size` permitted rows in `order_by` order.
+    Chunks are fetched with the keyset cursor, so memory stays bounded by the
+    chunk size however many rows match.
+    """
+    sort_keys = get_sort_keys(order_by)
+    order_by = ", ".join(f"{fieldname} {direction}" for fieldname, direction in sort_keys)
+    fields = list(fields)
+    for fieldname, _direction in sort_keys:
+        if fieldname not in fields:
+            fields.append(fieldname)
+
+    cursor = None
+    while True:
+        chunk, cursor = get_list_page(
+            doctype, fields, filters, order_by, sort_keys, cursor, chunk_size
+        )
+        if chunk:
+            yield chunk
+        if not cursor:
+            return
+
+
+def get_grouped_data(
+    doctype,
+    filters,
+    rows,
+    order_by,
+    sort_keys,
+    group_by_field,
+    label_doctype,
+    label_field,
+    group_page_length,
+):
+    """
+    Returns (groups, data, truncated) for a group_by view over the whole
+    permission filtered dataset instead of only the current page.
+
+    One GROUP BY gives the groups with their counts, then a single UNION ALL of
+    one LIMITed subquery per group (over the permitted `get_list` query) gives
+    the first `group_page_length` rows of each. Only the first MAX_GROUPS groups
+    are returned, `truncated` tells when there were more. Each group carries a
+    `next_cursor`; further rows of a group are paged lazily through
+    `get_list_data` with the group value added to the filters (`["is", "not set"]`
+    for the empty group) and that cursor.
+    """
+    validate_fieldname(group_by_field)
+
+    counts = frappe.get_list(
+        doctype,
+        filters=filters,
+        fields=[group_by_field, "count(*) as count"],
+        group_by=group_by_field,
+        order_by=f"{group_by_field} asc",
+        limit=MAX_GROUPS + 1,
+    )
+    truncated = len(counts) > MAX_GROUPS
+
+    # null and "" both make up the empty group
+    count_by_value = {}
+    for c in counts[:MAX_GROUPS]:
+        value = c.get(group_by_field) or ""
+        count_by_value[value] = count_by_value.get(value, 0) + c.count
+
+    rows_by_group = get_group_first_rows(
+        doctype,
+        filters,
+        rows,
+        order_by,
+        sort_keys,
+        group_by_field,
+        list(count_by_value),
+        group_page_length,
+    )
+
+    field = frappe.get_meta(doctype).get_field(group_by_field)
+    select_options = None
+    if field and field.fieldtype == "Select":
+        # select options are their own labels, and keep their declared order
+        select_options = (field.options or "").split("\n")
+        labels = {value: value for value in count_by_value}
+    else:
+        labels = get_labels(label_doctype, list(count_by_value), label_field)
+
+    groups = []
+    for value, count in count_by_value.items():
+        group_rows = rows_by_group.get(value, [])
+        next_cursor = None
+        if count > len(group_rows) and group_rows:
+            next_cursor = make_cursor(
+                order_by, sort_keys, group_rows[-1], len(group_rows)
+            )
+        groups.append(
+            {
+                "label": (labels.get(value) or "") if value else "",
+                "value": value,
+                "count": count,
+                "row_count": len(group_rows),
+                "next_cursor": next_cursor,
+            }
+        )
+
+    if select_options is not None:
+        order = {option: idx for idx, option in enumerate(select_options)}
+        groups.sort(
+            key=lambda group: order.get(group["value"], len(order)),
+            reverse=(group_by_field, "desc") in sort_keys,
+        )
+    else:
+        groups = sort_group_options(groups, sort_keys, group_by_field)
+    data = [row for group in groups for row in rows_by_group.get(group["value"], [])]
+    return groups, data, truncated
+
+
+def get_group_first_rows(
+    doctype, filters, rows, order_by, sort_keys, group_by_field, values, limit
+) -> dict:
+    """First `limit` rows of each group in `values`, keyed by group value."""
+    if not values:
+        return {}
+
+    base_query = frappe.get_list(
+        doctype,
+        fields=rows,
+        filters=filters,
+        order_by=order_by,
+        limit_page_length=0,
+        run=0,
+    )
+    column = f"matched.`{group_by_field}`"
+    ordering = ", ".join(
+        f"matched.`{fieldname}` {direction}" for fieldname, direction in sort_keys
+    )
+    subqueries = []
+    for value in values:
+        condition = (
+            f"{column} = {frappe.db.escape(value)}"
+            if value
+            else f"({column} is null or {column} = '')"
+        )
+        subqueries.append(
+            f"(select * from ({base_query}) as matched where {condition} "
+            f"order by {ordering} limit {cint(limit)})"
+        )
+    # no query values: the permitted query may contain literal `%`
+    data = frappe.db.sql(" union all ".join(subqueries), as_dict=True)
+
+    rows_by_group = {}
+    for row in data:
+        rows_by_group.setdefault(row.get(group_by_field) or "", []).append(row)
+    return rows_by_group
+
+
+def sort_group_options(options, sort_keys, group_by_field):
+    """Order group options by label, following the view sort, `General` first."""
+    if (group_by_field, "desc") in sort_keys:
+        options.sort(reverse=True, key=lambda x: x.get("label") or "")
+    else:
+        options.sort(key=lambda x: x.get("label") or "")
+
+    # general category at first position
+    idx = [idx for idx, o in enumerate(options) if o.get("label") == "General"]
+    if len(idx) == 0:
+        return options
+
+    idx = idx[0]
+    default_category = options[idx]
+    options.pop(idx)
+    options.insert(0, default_category)
+    return options
+
+
 @frappe.whitelist()
 @redis_cache()
 def get_filterable_fields(doctype: str, show_customer_portal_fields=False):
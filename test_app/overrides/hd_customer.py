@@ -1,6 +1,8 @@
 import frappe
 from frappe.model.document import Document
 
+from test_app.customer_cache import clear_customer_projection
+
 
 class HDCustomer(Document):
     def validate(self):
@@ -40,6 +42,12 @@ class HDCustomer(Document):
             alert=True
         )
 
+    def on_update(self):
+        clear_customer_projection(self.name)
+
+    def on_trash(self):
+        clear_customer_projection(self.name)
+
     @staticmethod
     def default_list_data():
         columns = [
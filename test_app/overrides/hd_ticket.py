@@ -33,13 +33,14 @@ from helpdesk.helpdesk.utils.email import (
 from helpdesk.search import HelpdeskSearch
 from helpdesk.utils import (
     capture_event,
-    get_agents_team,
     get_customer,
-    is_admin,
     is_agent,
     publish_event,
 )
 
+from test_app.permissions import get_permission_query_conditions, is_ticket_visible
+from test_app.view_state import record_ticket_view
+
 from ..hd_notification.utils import clear as clear_notifications
 from ..hd_service_level_agreement.utils import get_sla
 
@@ -792,6 +793,8 @@ class HDTicket(Document):
         self.add_viewed(
             unique_views=True, force=True
         )  # Document class method, no way to add unique_views via document settings, hence used force and unique_views=True
+        # the stock endpoints read View Log, the timeline reads the view state
+        record_ticket_view(self.name)
         clear_notifications(ticket=self.name)
 
     def get_escalation_rule(self):
@@ -1125,107 +1128,13 @@ def has_permission(doc, user=None):
 
     if not user:
         user = frappe.session.user
-
-    if (
-        doc.contact == user
-        or doc.raised_by == user
-        or doc.owner == user
-        or is_admin(user)
-        or doc.customer in get_customer(user)
-    ):
-        return True
-
-    if not is_agent(user):
-        return False
-
-    enable_restrictions = frappe.db.get_single_value(
-        "HD Settings", "restrict_tickets_by_agent_group"
-    )
-    if not enable_restrictions:
-        return True
-    show_tickets_without_team = frappe.db.get_single_value(
-        "HD Settings", "do_not_restrict_tickets_without_an_agent_group"
-    )
-    if show_tickets_without_team and not doc.get("agent_group"):
-        return True
-
-    teams = get_agents_team()
-    if any([team.get("ignore_restrictions") for team in teams]):
-        return True
-
-    team_names = [t.team_name for t in teams]
-    exists = frappe.db.exists(
-        "HD Team Member", {"parent": ["in", team_names], "user": frappe.session.user}
-    )
-    if exists and doc.get("agent_group") in team_names:
-        return True
-
-    return False
+    return is_ticket_visible(doc, user)
 
 
 # Custom perms for list query. Only the `WHERE` part
 # https://frappeframework.com/docs/user/en/python-api/hooks#modify-list-query
 def permission_query(user):
-
-    if not user:
-        user = frappe.session.user
-    if is_admin(user):
-        return
-
-    #  To handle the case for normal users i.e. not agents
-    customer = get_customer(user)
-    query = "(`tabHD Ticket`.owner = {user} OR `tabHD Ticket`.contact = {user} OR `tabHD Ticket`.raised_by = {user})".format(
-        user=frappe.db.escape(user)
-    )
-    for c in customer:
-        query += " OR `tabHD Ticket`.customer={customer}".format(
-            customer=frappe.db.escape(c)
-        )
-
-    if not is_agent(user):
-        return query
-
-    enable_restrictions = frappe.db.get_single_value(
-        "HD Settings", "restrict_tickets_by_agent_group"
-    )
-    if not enable_restrictions:
-        return  # If not enabled, return all tickets
-
-    show_tickets_without_team = frappe.db.get_single_value(
-        "HD Settings", "do_not_restrict_tickets_without_an_agent_group"
-    )
-
-    teams = get_agents_team()
-
-    if show_tickets_without_team:
-        query += " OR (`tabHD Ticket`.agent_group is null OR `tabHD Ticket`.agent_group = '')"
-
-    # If agent belongs to the team which has ignore_permission set to 1.
-    # that means this team can see all the tickets without any restriction,
-    # Event the other team's tickets.
-    if any(team.get("ignore_restrictions") for team in teams):
-        all_teams = frappe.get_all("HD Team", pluck="name")
-        if not all_teams:
-            return query
-        all_teams = ", ".join(f"'{team}'" for team in all_teams)
-        query += f" OR (`tabHD Ticket`.agent_group in ({all_teams}))".format(
-            all_teams=all_teams
-        )
-        if not show_tickets_without_team:
-            query += " OR (`tabHD Ticket`.agent_group is null)"
-        return query
-
-    team_names = [t.get("team_name") for t in teams]
-
-    if not team_names:
-        return query
-
-    # Here we will apply the restriction based on the teams the agent belongs to.
-    team_names = ", ".join(f"'{team}'" for team in team_names)
-    query += f" OR (`tabHD Ticket`.agent_group in ({team_names}))".format(
-        team_names=team_names
-    )
-    return query
+    return get_permission_query_conditions(user)
 
 
 def set_guest_ticket_creation_permission():
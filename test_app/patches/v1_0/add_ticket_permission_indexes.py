@@ -0,0 +1,5 @@
+from test_app.permissions import add_permission_indexes
+
+
+def execute():
+    add_permission_indexes()
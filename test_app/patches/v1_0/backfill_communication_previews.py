@@ -0,0 +1,19 @@
+from frappe.custom.doctype.custom_field.custom_field import create_custom_field
+
+from test_app.thread import backfill_communication_previews
+
+
+def execute():
+    # fixtures are synced after patches, the column must exist before backfilling
+    create_custom_field(
+        "Communication",
+        {
+            "fieldname": "custom_preview",
+            "fieldtype": "Small Text",
+            "label": "Preview",
+            "insert_after": "content",
+            "read_only": 1,
+            "no_copy": 1,
+        },
+    )
+    backfill_communication_previews()
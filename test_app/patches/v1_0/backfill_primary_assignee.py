@@ -0,0 +1,33 @@
+from frappe.custom.doctype.custom_field.custom_field import create_custom_fields
+
+from test_app.utils import backfill_primary_assignee
+
+
+def execute():
+    # fixtures are synced after patches, the columns must exist before backfilling
+    create_custom_fields(
+        {
+            "HD Ticket": [
+                {
+                    "fieldname": "custom_primary_assignee",
+                    "fieldtype": "Link",
+                    "options": "User",
+                    "label": "Primary Assignee",
+                    "insert_after": "custom_location",
+                    "read_only": 1,
+                    "no_copy": 1,
+                    "search_index": 1,
+                },
+                {
+                    "fieldname": "custom_primary_assignee_full_name",
+                    "fieldtype": "Data",
+                    "label": "Primary Assignee Name",
+                    "insert_after": "custom_primary_assignee",
+                    "read_only": 1,
+                    "no_copy": 1,
+                    "search_index": 1,
+                },
+            ]
+        }
+    )
+    backfill_primary_assignee()
@@ -0,0 +1,5 @@
+from test_app.view_state import import_view_logs
+
+
+def execute():
+    import_view_logs()
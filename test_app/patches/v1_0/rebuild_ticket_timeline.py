@@ -0,0 +1,5 @@
+from test_app.timeline import rebuild_timeline
+
+
+def execute():
+    rebuild_timeline()
@@ -0,0 +1,243 @@
+import frappe
+
+from helpdesk.utils import get_customer, is_admin, is_agent
+
+# Safety net for changes that bypass the document hooks
+PERMISSION_CONTEXT_TTL = 60 * 60
+
+
+def get_permission_context(user: str | None = None) -> frappe._dict:
+    """
+    Everything the HD Ticket permission rules need to know about `user`,
+    resolved once and cached until a team, agent, contact, customer or the
+    HD Settings change:
+
+    - is_admin, is_agent
+    - customers: HD Customers linked to the user's contact
+    - restrict_by_team: `restrict_tickets_by_agent_group` is enabled
+    - show_tickets_without_team: `do_not_restrict_tickets_without_an_agent_group`
+    - ignore_restrictions: the user is in a team that can see every ticket
+    - teams: names of the teams the user is a member of
+    """
+    user = user or frappe.session.user
+    key = get_permission_context_key(user)
+    context = frappe.cache().get_value(key)
+    if context is None:
+        context = build_permission_context(user)
+        frappe.cache().set_value(key, context, expires_in_sec=PERMISSION_CONTEXT_TTL)
+    return frappe._dict(context)
+
+
+def build_permission_context(user: str) -> dict:
+    context = {
+        "is_admin": bool(is_admin(user)),
+        "is_agent": bool(is_agent(user)),
+        "customers": list(get_customer(user)),
+        "restrict_by_team": False,
+        "show_tickets_without_team": False,
+        "ignore_restrictions": False,
+        "teams": [],
+    }
+    if context["is_admin"] or not context["is_agent"]:
+        return context
+
+    settings = frappe.db.get_value(
+        "HD Settings",
+        "HD Settings",
+        [
+            "restrict_tickets_by_agent_group",
+            "do_not_restrict_tickets_without_an_agent_group",
+        ],
+        as_dict=True,
+    )
+    context["restrict_by_team"] = bool(settings.restrict_tickets_by_agent_group)
+    context["show_tickets_without_team"] = bool(
+        settings.do_not_restrict_tickets_without_an_agent_group
+    )
+
+    QBTeam = frappe.qb.DocType("HD Team")
+    QBTeamMember = frappe.qb.DocType("HD Team Member")
+    teams = (
+        frappe.qb.from_(QBTeam)
+        .join(QBTeamMember)
+        .on(QBTeamMember.parent == QBTeam.name)
+        .select(QBTeam.name, QBTeam.ignore_restrictions)
+        .where(QBTeamMember.user == user)
+        .run(as_dict=True)
+    )
+    context["teams"] = sorted({t.name for t in teams})
+    context["ignore_restrictions"] = any(t.ignore_restrictions for t in teams)
+    return context
+
+
+def get_permission_context_key(user: str) -> str:
+    generation = frappe.cache().get_value("ticket_permission_generation") or "0"
+    return f"ticket_permission_context::{generation}::{user}"
+
+
+def clear_permission_context(user: str | None = None):
+    """Drop the cached context of `user`, or of every user."""
+    if user:
+        frappe.cache().delete_value(get_permission_context_key(user))
+    else:
+        frappe.cache().set_value(
+            "ticket_permission_generation", frappe.generate_hash(length=10)
+        )
+
+
+def clear_all_permission_contexts(doc, method=None, *args):
+    """
+    HD Team, HD Customer and HD Settings hook. HD Team Member rows are saved
+    with their team, and `after_rename` (which passes old and new names) is
+    handled too, since contexts hold team names.
+    """
+    clear_permission_context()
+
+
+def on_agent_change(doc, method=None):
+    clear_permission_context(doc.user)
+    before = doc.get_doc_before_save() if method == "on_update" else None
+    if before and before.user != doc.user:
+        clear_permission_context(before.user)
+
+
+def on_contact_change(doc, method=None):
+    """The HD Customer links of a contact decide which tickets its user sees."""
+    users = {doc.name, doc.get("user"), doc.get("email_id")}
+    users.update(e.email_id for e in doc.get("email_ids") or [])
+    for user in users:
+        if user:
+            clear_permission_context(user)
+
+
+def on_user_change(doc, method=None):
+    """Roles decide whether a user is an admin or an agent."""
+    clear_permission_context(doc.name)
+
+
+# HD Ticket columns the visibility rules read
+VISIBILITY_FIELDS = ("name", "owner", "contact", "raised_by", "customer", "agent_group")
+
+
+def is_ticket_visible(ticket, user: str, context=None) -> bool:
+    """
+    `has_permission` rules for one ticket (a document or a dict with the
+    VISIBILITY_FIELDS), evaluated against the cached permission context.
+    """
+    context = context or get_permission_context(user)
+    if (
+        ticket.get("contact") == user
+        or ticket.get("raised_by") == user
+        or ticket.get("owner") == user
+        or context.is_admin
+        or ticket.get("customer") in context.customers
+    ):
+        return True
+
+    if not context.is_agent:
+        return False
+    if not context.restrict_by_team:
+        return True
+    if context.show_tickets_without_team and not ticket.get("agent_group"):
+        return True
+    if context.ignore_restrictions:
+        return True
+    return ticket.get("agent_group") in context.teams
+
+
+def filter_permitted_tickets(tickets, user: str | None = None) -> list:
+    """
+    The subset of ticket names `user` may read, in the given order. The rule
+    columns of all tickets are fetched with one query; names that do not
+    exist are dropped.
+    """
+    user = user or frappe.session.user
+    names = list(dict.fromkeys(str(t) for t in tickets if t))
+    if not names:
+        return []
+
+    context = get_permission_context(user)
+    rows = frappe.get_all(
+        "HD Ticket",
+        filters={"name": ["in", names]},
+        fields=list(VISIBILITY_FIELDS),
+    )
+    visible = {str(row.name) for row in rows if is_ticket_visible(row, user, context)}
+    return [name for name in names if name in visible]
+
+
+@frappe.whitelist()
+def get_permitted_tickets(tickets):
+    """Names out of `tickets` (a list or JSON list) the session user may read."""
+    return filter_permitted_tickets(frappe.parse_json(tickets) or [])
+
+
+# Columns the HD Ticket visibility rules filter on, each needs its own index so
+# that the OR of the rules can be answered with an index merge
+PERMISSION_INDEX_COLUMNS = ("owner", "contact", "raised_by", "customer", "agent_group")
+# Visible set first, then the usual sort order
+PERMISSION_COMPOSITE_INDEXES = (
+    ("agent_group", "modified"),
+    ("customer", "modified"),
+    ("raised_by", "modified"),
+)
+
+
+def get_permission_query_conditions(user: str | None = None) -> str | None:
+    """
+    WHERE fragment limiting HD Ticket to the rows `user` may see, None when
+    the user sees every ticket. Every branch compares one indexed column with
+    escaped values, so the database can merge index lookups instead of
+    scanning the table.
+    """
+    user = user or frappe.session.user
+    context = get_permission_context(user)
+    if context.is_admin:
+        return None
+    if context.is_agent and not context.restrict_by_team:
+        return None
+    if context.is_agent and context.ignore_restrictions:
+        # every existing team plus the unassigned tickets
+        if context.show_tickets_without_team:
+            return None
+        conditions = get_own_ticket_conditions(user, context)
+        conditions.append(
+            "`tabHD Ticket`.agent_group is null OR `tabHD Ticket`.agent_group != ''"
+        )
+        return "({0})".format(" OR ".join(conditions))
+
+    conditions = get_own_ticket_conditions(user, context)
+    if context.is_agent:
+        if context.teams:
+            conditions.append(
+                "`tabHD Ticket`.agent_group in ({0})".format(escape_values(context.teams))
+            )
+        if context.show_tickets_without_team:
+            conditions.append("`tabHD Ticket`.agent_group is null")
+            conditions.append("`tabHD Ticket`.agent_group = ''")
+    return "({0})".format(" OR ".join(conditions))
+
+
+def get_own_ticket_conditions(user: str, context) -> list[str]:
+    user = frappe.db.escape(user)
+    conditions = [
+        f"`tabHD Ticket`.owner = {user}",
+        f"`tabHD Ticket`.contact = {user}",
+        f"`tabHD Ticket`.raised_by = {user}",
+    ]
+    if context.customers:
+        conditions.append(
+            "`tabHD Ticket`.customer in ({0})".format(escape_values(context.customers))
+        )
+    return conditions
+
+
+def escape_values(values) -> str:
+    return ", ".join(frappe.db.escape(v) for v in values)
+
+
+def add_permission_indexes():
+    for column in PERMISSION_INDEX_COLUMNS:
+        frappe.db.add_index("HD Ticket", [column])
+    for columns in PERMISSION_COMPOSITE_INDEXES:
+        frappe.db.add_index("HD Ticket", list(columns))
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, soware and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("HD Ticket Timeline Event", {
+// 	refresh(frm) {
+
+// 	},
+// });
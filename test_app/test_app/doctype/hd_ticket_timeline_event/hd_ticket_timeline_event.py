@@ -0,0 +1,14 @@
+# Copyright (c) 2026, soware and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class HDTicketTimelineEvent(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("HD Ticket Timeline Event", ["ticket", "timestamp"])
+	frappe.db.add_index("HD Ticket Timeline Event", ["reference_doctype", "reference_name"])
@@ -0,0 +1,13 @@
+# Copyright (c) 2026, soware and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class HDTicketViewState(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("HD Ticket View State", ["ticket", "last_seen"])
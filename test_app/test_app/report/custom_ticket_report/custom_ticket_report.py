@@ -53,14 +53,7 @@ def get_grouped_data(filters):
     if filters.get("custom_customer_name"):
         conditions += f" AND t.custom_customer_name = {frappe.db.escape(filters.get('custom_customer_name'))}"
     if filters.get("assigned_to"):
-        conditions += f"""
-            AND (
-                SELECT a.allocated_to
-                FROM `tabToDo` a
-                WHERE a.reference_type = 'HD Ticket' AND a.reference_name = t.name
-                ORDER BY a.creation DESC LIMIT 1
-            ) = {frappe.db.escape(filters.get("assigned_to"))}
-        """
+        conditions += f" AND t.custom_primary_assignee = {frappe.db.escape(filters.get('assigned_to'))}"
     if filters.get("agent_group"):
         conditions += f" AND t.agent_group = {frappe.db.escape(filters.get('agent_group'))}"
 
@@ -70,11 +63,7 @@ def get_grouped_data(filters):
             t.name, t.creation, t.subject, t.custom_customer_name,
             t.custom_phone_number, t.agent_group, t.status, t.priority,
             t.custom_time_worked,
-            (
-                SELECT u.full_name FROM `tabToDo` a JOIN `tabUser` u ON u.name = a.allocated_to
-                WHERE a.reference_type = 'HD Ticket' AND a.reference_name = t.name
-                ORDER BY a.creation DESC LIMIT 1
-            ) AS assignee_name,
+            t.custom_primary_assignee_full_name AS assignee_name,
             COALESCE(GROUP_CONCAT(DISTINCT c.content SEPARATOR ' || '), '') AS latest_comment
         FROM `tabHD Ticket` t
         LEFT JOIN `tabHD Ticket Comment` c ON c.reference_ticket = t.name
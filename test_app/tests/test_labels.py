@@ -0,0 +1,35 @@
+# Copyright (c) 2026, soware and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from test_app.labels import clear_label_cache, get_labels
+
+
+class TestLabels(FrappeTestCase):
+	def setUp(self):
+		clear_label_cache()
+		self.groups = frappe.get_all("Role", pluck="name", limit=25)
+
+	def test_group_labels_resolved_with_one_query(self):
+		# resolving each group on its own costs one query per group ...
+		with self.assertQueryCount(len(self.groups)):
+			expected = {
+				group: frappe.db.get_value("Role", group, "role_name") for group in self.groups
+			}
+
+		# ... while the resolver needs a single query for all of them
+		with self.assertQueryCount(1):
+			labels = get_labels("Role", self.groups, "role_name")
+
+		self.assertEqual(labels, expected)
+
+	def test_cached_group_labels_need_no_query(self):
+		get_labels("Role", self.groups, "role_name")
+		with self.assertQueryCount(0):
+			get_labels("Role", self.groups, "role_name")
+
+	def test_unknown_group_label_is_none(self):
+		labels = get_labels("Role", ["_Test Missing Role"], "role_name")
+		self.assertIsNone(labels["_Test Missing Role"])
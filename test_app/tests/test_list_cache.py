@@ -0,0 +1,43 @@
+# Copyright (c) 2026, soware and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from test_app.list_cache import get_total_count
+
+TEST_SUBJECT = "_Test List Cache"
+
+
+def make_ticket(subject=TEST_SUBJECT):
+	return frappe.get_doc(
+		{
+			"doctype": "HD Ticket",
+			"subject": subject,
+			"raised_by": "list-cache@example.com",
+			"description": subject,
+		}
+	).insert(ignore_permissions=True)
+
+
+class TestListCountCache(FrappeTestCase):
+	def setUp(self):
+		self.filters = {"subject": TEST_SUBJECT}
+
+	def test_new_ticket_invalidates_count(self):
+		count, _is_estimated = get_total_count("HD Ticket", self.filters)
+		make_ticket()
+		self.assertEqual(get_total_count("HD Ticket", self.filters)[0], count + 1)
+
+	def test_changed_filter_field_invalidates_count(self):
+		ticket = make_ticket()
+		count, _is_estimated = get_total_count("HD Ticket", self.filters)
+		ticket.subject = f"{TEST_SUBJECT} (moved)"
+		ticket.save(ignore_permissions=True)
+		self.assertEqual(get_total_count("HD Ticket", self.filters)[0], count - 1)
+
+	def test_other_doctypes_are_not_cached(self):
+		filters = {"title": ("like", f"{TEST_SUBJECT}%")}
+		count, _is_estimated = get_total_count("Note", filters)
+		frappe.get_doc({"doctype": "Note", "title": f"{TEST_SUBJECT} Note"}).insert()
+		self.assertEqual(get_total_count("Note", filters)[0], count + 1)
@@ -0,0 +1,74 @@
+# Copyright (c) 2026, soware and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from test_app.overrides.doc import get_list_page, get_sort_keys, parse_cursor
+
+TEST_TITLE = "_Test List Cursor"
+
+# expiry dates of the test notes, with ties and empty values
+EXPIRY_DATES = [
+	"2026-01-03",
+	None,
+	"2026-01-01",
+	"2026-01-02",
+	None,
+	"2026-01-02",
+	"2026-01-02",
+	None,
+	"2026-01-01",
+]
+
+
+class TestListCursor(FrappeTestCase):
+	def setUp(self):
+		frappe.db.delete("Note", {"title": ("like", f"{TEST_TITLE}%")})
+		for idx, expiry in enumerate(EXPIRY_DATES):
+			note = frappe.get_doc({"doctype": "Note", "title": f"{TEST_TITLE} {idx}"}).insert()
+			frappe.db.set_value(
+				"Note", note.name, "expire_notification_on", expiry, update_modified=False
+			)
+		self.filters = [["Note", "title", "like", f"{TEST_TITLE}%"]]
+
+	def page_through(self, order_by, page_length):
+		sort_keys = get_sort_keys(order_by)
+		order_by = ", ".join(f"{fieldname} {direction}" for fieldname, direction in sort_keys)
+		names, cursors, cursor = [], [], None
+		while True:
+			data, cursor = get_list_page(
+				"Note", ["name"], self.filters, order_by, sort_keys, cursor, page_length
+			)
+			names += [row.name for row in data]
+			if not cursor:
+				return names, cursors
+			cursors.append(cursor)
+
+	def expected(self, order_by):
+		return frappe.get_all("Note", filters=self.filters, order_by=order_by, pluck="name")
+
+	def test_desc_pages_reach_trailing_empty_values(self):
+		names, _cursors = self.page_through("expire_notification_on desc", 2)
+		self.assertEqual(names, self.expected("expire_notification_on desc, name desc"))
+
+	def test_asc_pages_start_with_empty_values(self):
+		names, _cursors = self.page_through("expire_notification_on asc", 2)
+		self.assertEqual(names, self.expected("expire_notification_on asc, name asc"))
+
+	def test_ties_are_neither_skipped_nor_repeated(self):
+		for page_length in (1, 2, 3, 4):
+			names, _cursors = self.page_through("expire_notification_on desc", page_length)
+			self.assertEqual(len(names), len(EXPIRY_DATES))
+			self.assertEqual(len(set(names)), len(EXPIRY_DATES))
+
+	def test_compound_sort_pages_with_empty_values(self):
+		for direction in ("asc", "desc"):
+			order_by = f"expire_notification_on {direction}, title desc"
+			names, _cursors = self.page_through(order_by, 2)
+			self.assertEqual(names, self.expected(f"{order_by}, name {direction}"))
+
+	def test_cursor_carries_running_position(self):
+		_names, cursors = self.page_through("expire_notification_on desc", 2)
+		positions = [parse_cursor(cursor)["start"] for cursor in cursors]
+		self.assertEqual(positions, [2 * (idx + 1) for idx in range(len(cursors))])
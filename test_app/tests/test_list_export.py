@@ -0,0 +1,39 @@
+# Copyright (c) 2026, soware and Contributors
+# See license.txt
+
+import csv
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from test_app.list_export import run_export
+
+TEST_TITLE = "_Test List Export"
+
+
+class TestListExport(FrappeTestCase):
+	def setUp(self):
+		frappe.db.delete("Note", {"title": ("like", f"{TEST_TITLE}%")})
+		for idx in range(7):
+			note = frappe.get_doc({"doctype": "Note", "title": f"{TEST_TITLE} {idx}"}).insert()
+			# every other row has no expiry date, with ties between the others
+			expiry = None if idx % 2 else f"2026-01-0{idx % 3 + 1}"
+			frappe.db.set_value(
+				"Note", note.name, "expire_notification_on", expiry, update_modified=False
+			)
+		self.filters = {"title": ("like", f"{TEST_TITLE}%")}
+
+	def test_export_has_every_row(self):
+		columns = [{"label": "Name", "key": "name"}]
+		with patch("test_app.list_export.EXPORT_CHUNK_SIZE", 2), patch.object(
+			frappe.db, "commit"
+		):
+			run_export("Note", self.filters, "expire_notification_on desc", columns)
+
+		file_doc = frappe.get_last_doc("File", filters={"file_name": ("like", "note-%")})
+		with open(file_doc.get_full_path(), newline="", encoding="utf-8") as f:
+			exported = [row[0] for row in csv.reader(f)][1:]
+
+		self.assertEqual(len(exported), frappe.db.count("Note", self.filters))
+		self.assertEqual(len(set(exported)), len(exported))
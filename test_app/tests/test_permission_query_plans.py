@@ -0,0 +1,206 @@
+# Copyright (c) 2026, soware and Contributors
+# See license.txt
+
+"""
+Plan regression suite for the HD Ticket permission condition.
+
+Runs `permission_query` output through the list and count queries for one
+user of each kind and fails when a query examines more rows than its budget,
+which is what happens when a permission change turns index seeks into full
+scans. The EXPLAIN checks make sure every branch of the condition can use an
+index. Needs a seeded site, e.g.
+`bench --site <site> helpdesk-bench-seed --tickets 500000`.
+
+The list query may examine `factor * LIST_LIMIT + floor` rows, the count
+query `factor * matching rows + floor`. Budgets can be tuned in site_config:
+    "permission_plan_budget": {"list": {"factor": 50, "floor": 5000}}
+    "permission_plan_budgets": {"restricted_agent:count": 60000}
+"""
+
+import json
+import time
+import unittest
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import cint
+
+from helpdesk.helpdesk.doctype.hd_ticket.hd_ticket import permission_query
+from test_app.benchmark import BENCH_DOMAIN, BENCH_PREFIX
+from test_app.permissions import (
+	add_permission_indexes,
+	clear_permission_context,
+	get_permission_query_conditions,
+)
+
+# Plans are only meaningful on a realistically sized table
+PLAN_TEST_TICKETS = 500000
+LIST_LIMIT = 20
+# rows examined may be at most factor * LIST_LIMIT (list) or factor * matching
+# rows (count), plus floor
+DEFAULT_BUDGET = {
+	"list": {"factor": 50, "floor": 5000},
+	"count": {"factor": 2, "floor": 1000},
+}
+QUERIES = {
+	"list": "select `tabHD Ticket`.name from `tabHD Ticket` {where} "
+	f"order by `tabHD Ticket`.modified desc limit {LIST_LIMIT}",
+	"count": "select count(*) from `tabHD Ticket` {where}",
+}
+
+
+def get_handler_reads() -> int:
+	rows = frappe.db.sql("show session status like 'Handler_read%%'")
+	return sum(cint(value) for _name, value in rows)
+
+
+class TestPermissionQueryPlans(FrappeTestCase):
+	plans = {}
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		min_tickets = cint(frappe.conf.get("permission_plan_test_tickets") or PLAN_TEST_TICKETS)
+		if frappe.db.count("HD Ticket") < min_tickets:
+			raise unittest.SkipTest(
+				f"needs {min_tickets} tickets, seed them with "
+				f"`bench --site <site> helpdesk-bench-seed --tickets {min_tickets}`"
+			)
+		add_permission_indexes()
+
+		configured = frappe.conf.get("permission_plan_budget") or {}
+		cls.budget = {
+			kind: {**budget, **(configured.get(kind) or {})}
+			for kind, budget in DEFAULT_BUDGET.items()
+		}
+		cls.budgets = frappe.conf.get("permission_plan_budgets") or {}
+		cls.teams = frappe.get_all(
+			"HD Team", filters={"name": ["like", f"{BENCH_PREFIX}-team-%"]}, pluck="name", limit=2
+		)
+		cls.customer = frappe.get_all(
+			"HD Customer", filters={"name": ["like", f"{BENCH_PREFIX}-customer-%"]}, pluck="name", limit=1
+		)[0]
+
+	@classmethod
+	def tearDownClass(cls):
+		if cls.plans:
+			with open(frappe.get_site_path("private", "permission_query_plans.json"), "w") as f:
+				json.dump(cls.plans, f, indent=1, default=str)
+		super().tearDownClass()
+
+	def setUp(self):
+		frappe.db.set_single_value("HD Settings", "restrict_tickets_by_agent_group", 1)
+		frappe.db.set_single_value(
+			"HD Settings", "do_not_restrict_tickets_without_an_agent_group", 0
+		)
+		clear_permission_context()
+
+	def tearDown(self):
+		frappe.db.rollback()
+		clear_permission_context()
+
+	def get_team_agent(self, team):
+		return frappe.get_all("HD Team Member", filters={"parent": team}, pluck="user", limit=1)[0]
+
+	def make_portal_customer(self):
+		user = f"{BENCH_PREFIX}-portal@{BENCH_DOMAIN}"
+		contact = frappe.get_doc(
+			{
+				"doctype": "Contact",
+				"first_name": "Bench Portal",
+				"email_ids": [{"email_id": user, "is_primary": 1}],
+				"links": [{"link_doctype": "HD Customer", "link_name": self.customer}],
+			}
+		)
+		contact.insert(ignore_permissions=True, set_name=user)
+		return user
+
+	def assertUsesIndexes(self, user, columns):
+		conditions = get_permission_query_conditions(user)
+		self.assertIsNotNone(conditions)
+		plan = frappe.db.sql(
+			f"explain select count(*) from `tabHD Ticket` where {conditions}", as_dict=True
+		)
+		plan = next(row for row in plan if row.table == "tabHD Ticket")
+		self.assertNotEqual(plan.type, "ALL", f"full table scan: {plan}")
+		possible_keys = plan.possible_keys or ""
+		for column in columns:
+			self.assertIn(column, possible_keys, f"{column} index not usable: {plan}")
+
+	def run_plan(self, scenario, user):
+		conditions = permission_query(user)
+		where = f"where {conditions}" if conditions else ""
+		matched = frappe.db.sql(QUERIES["count"].format(where=where))[0][0]
+
+		for kind, query in QUERIES.items():
+			query = query.format(where=where)
+			explain = frappe.db.sql(f"explain {query}", as_dict=True)
+
+			# SHOW STATUS reads rows too, measure that overhead first
+			before = get_handler_reads()
+			overhead = get_handler_reads() - before
+			before = get_handler_reads()
+			start = time.monotonic()
+			frappe.db.sql(query)
+			elapsed_ms = (time.monotonic() - start) * 1000
+			examined = get_handler_reads() - before - overhead
+
+			key = f"{scenario}:{kind}"
+			expected = LIST_LIMIT if kind == "list" else matched
+			budget = self.budgets.get(key) or (
+				self.budget[kind]["factor"] * expected + self.budget[kind]["floor"]
+			)
+			self.plans[key] = {
+				"conditions": conditions,
+				"matched": matched,
+				"rows_examined": examined,
+				"budget": budget,
+				"time_ms": round(elapsed_ms, 2),
+				"explain": explain,
+			}
+			self.assertLessEqual(
+				examined,
+				budget,
+				f"{key} examined {examined} rows (budget {budget}), plan: {explain}",
+			)
+
+	def test_admin(self):
+		self.run_plan("admin", "Administrator")
+
+	def test_ignore_restrictions_agent(self):
+		frappe.db.set_value("HD Team", self.teams[0], "ignore_restrictions", 1)
+		self.run_plan("ignore_restrictions_agent", self.get_team_agent(self.teams[0]))
+
+	def test_restricted_agent(self):
+		self.run_plan("restricted_agent", self.get_team_agent(self.teams[-1]))
+
+	def test_restricted_agent_with_unassigned_tickets(self):
+		frappe.db.set_single_value(
+			"HD Settings", "do_not_restrict_tickets_without_an_agent_group", 1
+		)
+		self.run_plan("restricted_agent_unassigned", self.get_team_agent(self.teams[-1]))
+
+	def test_portal_customer(self):
+		self.run_plan("portal_customer", self.make_portal_customer())
+
+	def test_restricted_agent_indexes(self):
+		self.assertUsesIndexes(
+			self.get_team_agent(self.teams[-1]),
+			["agent_group", "owner", "raised_by", "contact"],
+		)
+
+	def test_ignore_restrictions_agent_lists_no_teams(self):
+		frappe.db.set_value("HD Team", self.teams[0], "ignore_restrictions", 1)
+		conditions = get_permission_query_conditions(self.get_team_agent(self.teams[0]))
+		self.assertNotIn(self.teams[0], conditions)
+		self.assertLess(len(conditions), 500)
+
+	def test_portal_customer_indexes(self):
+		self.assertUsesIndexes(self.make_portal_customer(), ["owner", "raised_by", "contact"])
+
+	def test_portal_customer_with_customer_indexes(self):
+		user = self.make_portal_customer()
+		with patch("test_app.permissions.get_customer", return_value=(self.customer,)):
+			clear_permission_context(user)
+			self.assertUsesIndexes(user, ["customer", "owner", "raised_by", "contact"])
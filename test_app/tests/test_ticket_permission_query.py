@@ -0,0 +1,113 @@
+# Copyright (c) 2026, soware and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from test_app.permissions import (
+	VISIBILITY_FIELDS,
+	filter_permitted_tickets,
+	get_permission_query_conditions,
+	is_ticket_visible,
+)
+
+
+def make_context(**values):
+	context = {
+		"is_admin": False,
+		"is_agent": False,
+		"customers": [],
+		"restrict_by_team": False,
+		"show_tickets_without_team": False,
+		"ignore_restrictions": False,
+		"teams": [],
+	}
+	context.update(values)
+	return frappe._dict(context)
+
+
+class TestTicketPermissionQuery(FrappeTestCase):
+	def get_conditions(self, user="someone@example.com", **context):
+		with patch(
+			"test_app.permissions.get_permission_context", return_value=make_context(**context)
+		):
+			return get_permission_query_conditions(user)
+
+	def test_values_are_escaped(self):
+		conditions = self.get_conditions(
+			user="o'brien@example.com",
+			is_agent=True,
+			restrict_by_team=True,
+			customers=["Customer's"],
+			teams=["Team'); drop table x; --"],
+		)
+		self.assertIn(frappe.db.escape("o'brien@example.com"), conditions)
+		self.assertIn(frappe.db.escape("Customer's"), conditions)
+		self.assertIn(frappe.db.escape("Team'); drop table x; --"), conditions)
+
+	def test_unrestricted_users_have_no_conditions(self):
+		self.assertIsNone(self.get_conditions(is_admin=True))
+		self.assertIsNone(self.get_conditions(is_agent=True))
+		self.assertIsNone(
+			self.get_conditions(
+				is_agent=True,
+				restrict_by_team=True,
+				ignore_restrictions=True,
+				show_tickets_without_team=True,
+			)
+		)
+
+	def test_ignore_restrictions_does_not_list_teams(self):
+		conditions = self.get_conditions(
+			is_agent=True, restrict_by_team=True, ignore_restrictions=True, teams=["Billing"]
+		)
+		self.assertNotIn("Billing", conditions)
+		self.assertNotIn(" in (", conditions)
+
+	def test_restricted_agent_filters_on_team(self):
+		conditions = self.get_conditions(
+			is_agent=True,
+			restrict_by_team=True,
+			show_tickets_without_team=True,
+			teams=["Billing"],
+		)
+		self.assertIn("`tabHD Ticket`.agent_group in ('Billing')", conditions)
+		self.assertIn("`tabHD Ticket`.agent_group is null", conditions)
+		self.assertIn("`tabHD Ticket`.agent_group = ''", conditions)
+
+	def test_customer_sees_own_tickets_only(self):
+		conditions = self.get_conditions(customers=["Acme"])
+		self.assertNotIn("agent_group", conditions)
+		self.assertIn("`tabHD Ticket`.customer in ('Acme')", conditions)
+
+
+class TestTicketPermissionBulkCheck(FrappeTestCase):
+	def test_checks_all_tickets_with_one_query(self):
+		tickets = frappe.get_all("HD Ticket", pluck="name", limit=50)
+		if not tickets:
+			self.skipTest("no tickets on this site")
+		context = make_context(is_agent=True, restrict_by_team=True, teams=["_Test Team"])
+		with patch("test_app.permissions.get_permission_context", return_value=context):
+			with self.assertQueryCount(1):
+				permitted = filter_permitted_tickets(tickets, "someone@example.com")
+
+		rows = frappe.get_all(
+			"HD Ticket", filters={"name": ["in", tickets]}, fields=list(VISIBILITY_FIELDS)
+		)
+		expected = {
+			str(row.name)
+			for row in rows
+			if is_ticket_visible(row, "someone@example.com", context)
+		}
+		self.assertEqual(set(permitted), expected)
+
+	def test_keeps_order_and_drops_unknown_tickets(self):
+		tickets = frappe.get_all("HD Ticket", pluck="name", limit=3, order_by="name asc")
+		context = make_context(is_admin=True)
+		with patch("test_app.permissions.get_permission_context", return_value=context):
+			permitted = filter_permitted_tickets(
+				[*reversed(tickets), "_Test Missing Ticket"], "someone@example.com"
+			)
+		self.assertEqual(permitted, [str(t) for t in reversed(tickets)])
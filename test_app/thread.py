@@ -0,0 +1,62 @@
+import re
+
+import frappe
+from bs4 import BeautifulSoup
+
+PREVIEW_LENGTH = 280
+PREVIEW_BATCH_SIZE = 1000
+# Quoted replies added by common mail clients
+QUOTE_SELECTORS = "blockquote, .gmail_quote, .gmail_extra, #divRplyFwdMsg, #appendonsend"
+
+
+def make_preview(content: str | None) -> str:
+    """Plain-text start of an email body, without quoted history."""
+    if not content:
+        return ""
+    soup = BeautifulSoup(content, "html.parser")
+    for quote in soup.select(QUOTE_SELECTORS):
+        quote.decompose()
+    text = re.sub(r"\s+", " ", soup.get_text(" ")).strip()
+    if len(text) > PREVIEW_LENGTH:
+        text = text[: PREVIEW_LENGTH - 1].rstrip() + "…"
+    return text
+
+
+def set_communication_preview(doc, method=None):
+    """Communication hook: keep `custom_preview` in sync with `content`."""
+    if doc.reference_doctype != "HD Ticket":
+        return
+    if doc.is_new() or doc.has_value_changed("content") or not doc.get("custom_preview"):
+        doc.custom_preview = make_preview(doc.content)
+
+
+def backfill_communication_previews(batch_size=PREVIEW_BATCH_SIZE):
+    """
+    Compute previews of existing ticket emails, `batch_size` bodies at a time.
+    Run with `bench --site <site> execute test_app.thread.backfill_communication_previews`
+    """
+    Communication = frappe.qb.DocType("Communication")
+    last_name = ""
+    while True:
+        rows = (
+            frappe.qb.from_(Communication)
+            .select(Communication.name, Communication.content)
+            .where(Communication.reference_doctype == "HD Ticket")
+            .where(Communication.custom_preview.isnull())
+            .where(Communication.name > last_name)
+            .orderby(Communication.name)
+            .limit(batch_size)
+            .run(as_dict=True)
+        )
+        if not rows:
+            break
+        last_name = rows[-1].name
+
+        for row in rows:
+            (
+                frappe.qb.update(Communication)
+                .set(Communication.custom_preview, make_preview(row.content))
+                .where(Communication.name == row.name)
+                .run()
+            )
+        frappe.db.commit()
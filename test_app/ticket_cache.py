@@ -0,0 +1,181 @@
+import hashlib
+import pickle
+
+import frappe
+
+from helpdesk.utils import is_agent
+
+ATTACHMENTS_CACHE = "ticket_attachments"
+USER_INFO_CACHE = "user_avatar_info"
+# Safety net for metadata changes that bypass the document hooks
+TICKET_META_CACHE_TTL = 24 * 60 * 60
+
+
+def get_attachments(doctype, name):
+    """Files attached to one record, cached until a File of that record changes."""
+    key = f"{doctype}::{name}"
+    attachments = frappe.cache().hget(ATTACHMENTS_CACHE, key)
+    if attachments is None:
+        attachments = get_attachments_map([(doctype, name)]).get((doctype, name), [])
+        frappe.cache().hset(ATTACHMENTS_CACHE, key, attachments)
+    return attachments
+
+
+def get_attachments_map(references) -> dict:
+    """
+    Files of many records with a single query, grouped by (doctype, name).
+    `references` is an iterable of (doctype, name) pairs.
+    """
+    references = set(references)
+    if not references:
+        return {}
+
+    QBFile = frappe.qb.DocType("File")
+    files = (
+        frappe.qb.from_(QBFile)
+        .select(
+            QBFile.name,
+            QBFile.file_url,
+            QBFile.file_name,
+            QBFile.attached_to_doctype,
+            QBFile.attached_to_name,
+        )
+        .where(QBFile.attached_to_doctype.isin(list({d for d, _n in references})))
+        .where(QBFile.attached_to_name.isin(list({n for _d, n in references})))
+        .run(as_dict=True)
+    )
+
+    attachments = {}
+    for f in files:
+        reference = (f.pop("attached_to_doctype"), f.pop("attached_to_name"))
+        if reference in references:
+            attachments.setdefault(reference, []).append(f)
+    return attachments
+
+
+CALL_LOG_FIELDS = (
+    "name",
+    "caller",
+    "receiver",
+    "duration",
+    "type",
+    "status",
+    "from",
+    "to",
+    "recording_url",
+    "creation",
+)
+
+
+def get_call_logs_map(tickets) -> dict:
+    """
+    Call logs linked to many tickets with a single query, keyed by ticket.
+    Only CALL_LOG_FIELDS are loaded, ordered by creation.
+    """
+    tickets = list({str(t) for t in tickets if t})
+    if not tickets:
+        return {}
+
+    QBLink = frappe.qb.DocType("Dynamic Link")
+    QBCall = frappe.qb.DocType("TP Call Log")
+    calls = (
+        frappe.qb.from_(QBLink)
+        .join(QBCall)
+        .on(QBCall.name == QBLink.parent)
+        .select(QBLink.link_name.as_("ticket"), *(QBCall[f] for f in CALL_LOG_FIELDS))
+        .where(QBLink.parenttype == "TP Call Log")
+        .where(QBLink.link_name.isin(tickets))
+        .orderby(QBCall.creation)
+        .run(as_dict=True)
+    )
+
+    calls_map = {}
+    for call in calls:
+        calls_map.setdefault(call.pop("ticket"), []).append(call)
+    return calls_map
+
+
+def clear_attachments_cache(doc, method=None):
+    """File hook: drop cached attachments of the record(s) the file belongs to."""
+    keys = {f"{doc.attached_to_doctype}::{doc.attached_to_name}"}
+    before = doc.get_doc_before_save() if method == "on_update" else None
+    if before:
+        keys.add(f"{before.attached_to_doctype}::{before.attached_to_name}")
+    for key in keys:
+        frappe.cache().hdel(ATTACHMENTS_CACHE, key)
+
+
+def get_user_info_map(users) -> dict:
+    """
+    Avatar info ({"email", "image", "name"}) of many users, keyed by user id.
+    Cached across requests until the User changes; users not cached yet are
+    fetched with a single query. Ids without a User fall back to the id itself,
+    like `frappe.utils.get_user_info_for_avatar`.
+    """
+    users = list({u for u in users if u})
+    if not users:
+        return {}
+
+    cache = frappe.cache()
+    infos = {}
+    values = cache.hmget(cache.make_key(USER_INFO_CACHE), users)
+    for user, value in zip(users, values):
+        if value is not None:
+            infos[user] = pickle.loads(value)
+
+    missing = [u for u in users if u not in infos]
+    if missing:
+        found = frappe.get_all(
+            "User",
+            filters={"name": ["in", missing]},
+            fields=["name", "email", "user_image", "full_name"],
+        )
+        found = {u.name: u for u in found}
+        for user in missing:
+            u = found.get(user)
+            infos[user] = (
+                {"email": u.email, "image": u.user_image, "name": u.full_name}
+                if u
+                else {"email": user, "image": "", "name": user}
+            )
+            cache.hset(USER_INFO_CACHE, user, infos[user])
+    return infos
+
+
+def clear_user_info_cache(doc, method=None):
+    """User hook: drop the cached avatar info of the user."""
+    frappe.cache().hdel(USER_INFO_CACHE, doc.name)
+
+
+def get_cached_ticket_meta(template: str, is_customer_portal, build):
+    """
+    Returns (meta, version) of the ticket form for `template`: template, form
+    script and field meta as built by `build()`, which is only called when the
+    metadata changed since it was last cached. `version` is a hash of `meta`
+    that clients can send back to skip it.
+    """
+    key = "ticket_meta::{0}::{1}::{2}::{3}".format(
+        get_ticket_meta_generation(),
+        template,
+        int(bool(is_customer_portal)),
+        # the template API hides fields from customers
+        int(bool(is_agent())),
+    )
+    cached = frappe.cache().get_value(key)
+    if cached is not None:
+        return cached["meta"], cached["version"]
+
+    meta = build()
+    version = hashlib.sha256(frappe.as_json(meta).encode()).hexdigest()[:16]
+    frappe.cache().set_value(
+        key, {"meta": meta, "version": version}, expires_in_sec=TICKET_META_CACHE_TTL
+    )
+    return meta, version
+
+
+def get_ticket_meta_generation() -> str:
+    return frappe.cache().get_value("ticket_meta_generation") or "0"
+
+
+def clear_ticket_meta_cache():
+    frappe.cache().set_value("ticket_meta_generation", frappe.generate_hash(length=10))
@@ -0,0 +1,194 @@
+import hashlib
+
+import frappe
+from frappe.utils import get_datetime, now_datetime
+
+EVENT_DOCTYPE = "HD Ticket Timeline Event"
+REBUILD_CHUNK_SIZE = 5000
+EVENT_FIELDS = [
+    "name",
+    "ticket",
+    "event_type",
+    "timestamp",
+    "actor",
+    "reference_doctype",
+    "reference_name",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+]
+
+# doctype: (event type, ticket field, actor field)
+# TP Call Log is linked to tickets through its Dynamic Link rows instead.
+TIMELINE_SOURCES = {
+    "HD Ticket Comment": ("comment", "reference_ticket", "commented_by"),
+    "Communication": ("communication", "reference_name", "sender"),
+    "HD Ticket Activity": ("history", "ticket", "owner"),
+    "HD Ticket View State": ("view", "ticket", "user"),
+    "TP Call Log": ("call", None, "caller"),
+}
+# Events are placed at `creation` of their record unless listed here
+TIMESTAMP_FIELDS = {"HD Ticket View State": "last_seen"}
+
+
+def make_event_name(reference_doctype: str, reference_name: str, ticket) -> str:
+    """Deterministic, so rebuilding and hooks never create duplicate events."""
+    key = f"{reference_doctype}::{reference_name}::{ticket}"
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def get_event_tickets(doc) -> list[str]:
+    if doc.doctype == "TP Call Log":
+        return list(
+            {str(link.link_name) for link in doc.get("links") or [] if link.link_doctype == "HD Ticket"}
+        )
+    if doc.doctype == "Communication" and doc.reference_doctype != "HD Ticket":
+        return []
+    _event_type, ticket_field, _actor_field = TIMELINE_SOURCES[doc.doctype]
+    ticket = doc.get(ticket_field)
+    return [str(ticket)] if ticket else []
+
+
+def sync_timeline_event(doc, method=None):
+    """on_update hook of the TIMELINE_SOURCES doctypes."""
+    event_type, _ticket_field, actor_field = TIMELINE_SOURCES[doc.doctype]
+    tickets = get_event_tickets(doc)
+    existing = frappe.get_all(
+        EVENT_DOCTYPE,
+        filters={"reference_doctype": doc.doctype, "reference_name": doc.name},
+        fields=["ticket", "actor", "timestamp"],
+    )
+    actor = doc.get(actor_field)
+    timestamp = get_datetime(doc.get(TIMESTAMP_FIELDS.get(doc.doctype, "creation")))
+    if {e.ticket for e in existing} == set(tickets) and all(
+        e.actor == actor and e.timestamp == timestamp for e in existing
+    ):
+        return
+
+    remove_timeline_event(doc)
+    insert_events(
+        [(ticket, event_type, timestamp, actor, doc.doctype, doc.name) for ticket in tickets]
+    )
+
+
+def remove_timeline_event(doc, method=None):
+    """on_trash hook of the TIMELINE_SOURCES doctypes."""
+    frappe.db.delete(EVENT_DOCTYPE, {"reference_doctype": doc.doctype, "reference_name": doc.name})
+
+
+def remove_ticket_timeline(doc, method=None):
+    """HD Ticket on_trash hook."""
+    frappe.db.delete(EVENT_DOCTYPE, {"ticket": doc.name})
+
+
+def insert_events(events):
+    """`events` are (ticket, event_type, timestamp, actor, reference_doctype, reference_name)."""
+    if not events:
+        return
+    now = now_datetime()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        EVENT_DOCTYPE,
+        EVENT_FIELDS,
+        [
+            (
+                make_event_name(reference_doctype, reference_name, ticket),
+                ticket,
+                event_type,
+                timestamp,
+                actor,
+                reference_doctype,
+                reference_name,
+                now,
+                now,
+                user,
+                user,
+            )
+            for ticket, event_type, timestamp, actor, reference_doctype, reference_name in events
+        ],
+        ignore_duplicates=True,
+    )
+
+
+def get_source_query(doctype: str):
+    """
+    Returns (query, key, ticket): `query` selects (name, ticket, timestamp,
+    actor, row_key) of every event of `doctype`; `key` is the unique column to
+    page on and `ticket` the column holding the ticket.
+    """
+    _event_type, ticket_field, actor_field = TIMELINE_SOURCES[doctype]
+    if doctype == "TP Call Log":
+        QBLink = frappe.qb.DocType("Dynamic Link")
+        QBCall = frappe.qb.DocType("TP Call Log")
+        query = (
+            frappe.qb.from_(QBLink)
+            .join(QBCall)
+            .on(QBCall.name == QBLink.parent)
+            .select(
+                QBCall.name,
+                QBLink.link_name.as_("ticket"),
+                QBCall.creation.as_("timestamp"),
+                QBCall[actor_field].as_("actor"),
+                QBLink.name.as_("row_key"),
+            )
+            .where(QBLink.parenttype == "TP Call Log")
+            .where(QBLink.link_doctype == "HD Ticket")
+        )
+        return query, QBLink.name, QBLink.link_name
+
+    Table = frappe.qb.DocType(doctype)
+    query = frappe.qb.from_(Table).select(
+        Table.name,
+        Table[ticket_field].as_("ticket"),
+        Table[TIMESTAMP_FIELDS.get(doctype, "creation")].as_("timestamp"),
+        Table[actor_field].as_("actor"),
+        Table.name.as_("row_key"),
+    )
+    if doctype == "Communication":
+        query = query.where(Table.reference_doctype == "HD Ticket")
+    return query.where(Table[ticket_field].isnotnull()), Table.name, Table[ticket_field]
+
+
+def rebuild_timeline(ticket=None, chunk_size=REBUILD_CHUNK_SIZE):
+    """
+    Recreate timeline events from their source records, of one or all tickets.
+    Run with `bench --site <site> helpdesk-rebuild-timeline [--ticket <name>]`
+    """
+    frappe.db.delete(EVENT_DOCTYPE, {"ticket": str(ticket)} if ticket else None)
+    for doctype, (event_type, _ticket_field, _actor_field) in TIMELINE_SOURCES.items():
+        if not frappe.db.table_exists(doctype):
+            continue
+        query, key, ticket_column = get_source_query(doctype)
+        if ticket:
+            query = query.where(ticket_column == str(ticket))
+
+        last_key = ""
+        while True:
+            rows = query.where(key > last_key).orderby(key).limit(chunk_size).run(as_dict=True)
+            if not rows:
+                break
+            last_key = rows[-1].row_key
+            insert_events(
+                [(r.ticket, event_type, r.timestamp, r.actor, doctype, r.name) for r in rows]
+            )
+            frappe.db.commit()
+
+
+def get_timeline_query(ticket: str, event_types):
+    """Events of `ticket` restricted to `event_types`, for keyset paging."""
+    Event = frappe.qb.DocType(EVENT_DOCTYPE)
+    query = (
+        frappe.qb.from_(Event)
+        .select(
+            Event.name,
+            Event.event_type,
+            Event.timestamp,
+            Event.actor,
+            Event.reference_doctype,
+            Event.reference_name,
+        )
+        .where(Event.ticket == str(ticket))
+        .where(Event.event_type.isin(list(event_types)))
+    )
+    return query, Event
@@ -1,6 +1,9 @@
 import json
 import frappe
 from frappe.desk.form.assign_to import add as add_assignment 
+from frappe.utils import now_datetime
+
+from test_app.list_cache import clear_response_cache, purge_ticket_responses
 
 NOT_ASSIGNED_STATUS = "Not Assigned"
 IN_PROGRESS_STATUS = "In Progress"
@@ -115,6 +118,7 @@ def _force_clear_all_assignments(doc):
     # 2️⃣ Clear assignment cache (_assign) - FORCE to None
     doc._assign = None
     frappe.db.set_value(doc.doctype, doc.name, "_assign", None)
+    sync_primary_assignee(doc.name)
     print(f"   🧹 Cleared _assign field")
     
     # 3️⃣ Ensure no reassignment happens in same save
@@ -122,6 +126,130 @@ def _force_clear_all_assignments(doc):
     print(f"   ✅ Committed changes")
 
 
+def get_primary_assignee(assign_raw):
+    """First user of an `_assign` value (JSON string or list), None if unassigned"""
+    if isinstance(assign_raw, str):
+        try:
+            assignees = json.loads(assign_raw) if assign_raw else []
+        except Exception:
+            assignees = []
+    elif isinstance(assign_raw, (list, tuple)):
+        assignees = list(assign_raw)
+    else:
+        assignees = []
+
+    first_user = assignees[0] if isinstance(assignees, list) and assignees else None
+    return first_user if isinstance(first_user, str) and first_user else None
+
+
+def sync_primary_assignee(ticket):
+    """Keep the denormalized primary assignee columns in line with `_assign`"""
+    # `_assign` is written with db.set_value, so cached lists are not purged
+    # by the ticket's on_update
+    purge_ticket_responses([ticket])
+    values = frappe.db.get_value(
+        "HD Ticket", ticket, ["_assign", "custom_primary_assignee"], as_dict=True
+    )
+    if not values:
+        return
+
+    # `_assign` is written without touching `modified`, bump it here so that
+    # list deltas (`modified > since`) pick assignment changes up
+    primary_assignee = get_primary_assignee(values._assign)
+    if primary_assignee == values.custom_primary_assignee:
+        frappe.db.set_value("HD Ticket", ticket, "modified", now_datetime())
+        return
+
+    full_name = None
+    if primary_assignee:
+        full_name = (
+            frappe.db.get_value("User", primary_assignee, "full_name")
+            or primary_assignee
+        )
+
+    frappe.db.set_value(
+        "HD Ticket",
+        ticket,
+        {
+            "custom_primary_assignee": primary_assignee,
+            "custom_primary_assignee_full_name": full_name,
+        },
+    )
+
+
+def sync_primary_assignee_from_todo(doc, method):
+    """ToDo hook: assignment changes rewrite `_assign` on the ticket"""
+    if doc.reference_type != "HD Ticket" or not doc.reference_name:
+        return
+    sync_primary_assignee(doc.reference_name)
+
+
+def update_primary_assignee_full_name(doc, method):
+    """User hook: carry full name changes over to the tickets assigned to them"""
+    if not doc.has_value_changed("full_name"):
+        return
+    frappe.db.set_value(
+        "HD Ticket",
+        {"custom_primary_assignee": doc.name},
+        "custom_primary_assignee_full_name",
+        doc.full_name or doc.name,
+        update_modified=False,
+    )
+    clear_response_cache("HD Ticket")
+
+
+def backfill_primary_assignee(batch_size=5000):
+    """
+    Fill the primary assignee columns for existing tickets.
+    Run with `bench --site <site> execute test_app.utils.backfill_primary_assignee`
+    """
+    Ticket = frappe.qb.DocType("HD Ticket")
+    last_name = 0
+    while True:
+        tickets = (
+            frappe.qb.from_(Ticket)
+            .select(Ticket.name, Ticket._assign)
+            .where(Ticket.name > last_name)
+            .orderby(Ticket.name)
+            .limit(batch_size)
+            .run(as_dict=True)
+        )
+        if not tickets:
+            break
+        last_name = tickets[-1].name
+
+        by_assignee = {}
+        for ticket in tickets:
+            primary_assignee = get_primary_assignee(ticket._assign)
+            by_assignee.setdefault(primary_assignee, []).append(ticket.name)
+
+        users = [user for user in by_assignee if user]
+        full_names = {}
+        if users:
+            full_names = dict(
+                frappe.get_all(
+                    "User",
+                    filters={"name": ["in", users]},
+                    fields=["name", "full_name"],
+                    as_list=True,
+                )
+            )
+
+        for primary_assignee, names in by_assignee.items():
+            full_name = None
+            if primary_assignee:
+                full_name = full_names.get(primary_assignee) or primary_assignee
+            (
+                frappe.qb.update(Ticket)
+                .set(Ticket.custom_primary_assignee, primary_assignee)
+                .set(Ticket.custom_primary_assignee_full_name, full_name)
+                .where(Ticket.name.isin(names))
+                .run()
+            )
+        frappe.db.commit()
+    clear_response_cache("HD Ticket")
+
+
 def _cleanup_removed_user_todos(doc, current_assigned_users):
     """Clean up ToDos for users who are NO LONGER in the assignment list"""
     todos = frappe.get_all(
@@ -184,6 +312,7 @@ def handle_start_ticket_assignment(doc, method):
     # 4. Update _assign
     frappe.db.set_value("HD Ticket", doc.name, "_assign", json.dumps([frappe.session.user]))
     doc._assign = [frappe.session.user]
+    sync_primary_assignee(doc.name)
 
     # 5. Ensure status flag
     if doc.status != IN_PROGRESS_STATUS:
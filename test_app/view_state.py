@@ -0,0 +1,143 @@
+import hashlib
+
+import frappe
+from frappe.utils import now_datetime
+
+from test_app.timeline import insert_events, sync_timeline_event
+
+VIEW_STATE_DOCTYPE = "HD Ticket View State"
+# Opens of a ticket by the same user within this window are one visit
+VIEW_COALESCE_SECONDS = 5 * 60
+IMPORT_BATCH_SIZE = 5000
+
+
+def make_view_state_name(ticket, user: str) -> str:
+    return hashlib.sha1(f"{ticket}::{user}".encode()).hexdigest()[:20]
+
+
+def record_ticket_view(ticket, user: str | None = None) -> bool:
+    """
+    Count a visit of `ticket` by `user`. Opens within VIEW_COALESCE_SECONDS of
+    the last recorded one are skipped without touching the database.
+    Returns True if the visit was written.
+    """
+    user = user or frappe.session.user
+    cache = frappe.cache()
+    recent_key = cache.make_key(f"ticket_view_recent::{ticket}::{user}")
+    if not cache.set(recent_key, 1, ex=VIEW_COALESCE_SECONDS, nx=True):
+        return False
+
+    now = now_datetime()
+    upsert_view_states([(str(ticket), user, now, now, 1)])
+    return True
+
+
+def upsert_view_states(states):
+    """
+    Merge (ticket, user, first_seen, last_seen, count) into the stored view
+    state of each pair and refresh their timeline events.
+    """
+    if not states:
+        return
+    now = now_datetime()
+    owner = frappe.session.user
+    values = []
+    params = []
+    for ticket, user, first_seen, last_seen, count in states:
+        values.append("(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)")
+        params += [
+            make_view_state_name(ticket, user),
+            ticket,
+            user,
+            first_seen,
+            last_seen,
+            count,
+            now,
+            now,
+            owner,
+            owner,
+        ]
+    frappe.db.sql(
+        f"""
+        insert into `tab{VIEW_STATE_DOCTYPE}`
+            (name, ticket, user, first_seen, last_seen, view_count,
+            creation, modified, owner, modified_by)
+        values {", ".join(values)}
+        on duplicate key update
+            first_seen = least(coalesce(first_seen, values(first_seen)), values(first_seen)),
+            last_seen = greatest(coalesce(last_seen, values(last_seen)), values(last_seen)),
+            view_count = view_count + values(view_count),
+            modified = values(modified)
+        """,
+        params,
+    )
+
+    names = [make_view_state_name(ticket, user) for ticket, user, *_rest in states]
+    for state in frappe.get_all(
+        VIEW_STATE_DOCTYPE,
+        filters={"name": ["in", names]},
+        fields=["name", "ticket", "user", "last_seen"],
+    ):
+        sync_timeline_event(frappe._dict(doctype=VIEW_STATE_DOCTYPE, **state))
+
+
+def import_view_logs(batch_size=IMPORT_BATCH_SIZE):
+    """
+    Seed the view state of (ticket, user) pairs that have View Log rows but no
+    view state yet. View Log is left in place: the stock helpdesk endpoints
+    still read it. Tickets are handled in batches and pairs that already have
+    a state are skipped, so the import can be interrupted and rerun.
+    Run once by hand with
+    `bench --site <site> execute test_app.view_state.import_view_logs`
+    """
+    now = now_datetime()
+    owner = frappe.session.user
+    last_name = 0
+    while True:
+        tickets = frappe.db.sql_list(
+            """
+            select name from `tabHD Ticket`
+            where name > %s
+            order by name
+            limit %s
+            """,
+            (last_name, batch_size),
+        )
+        if not tickets:
+            break
+        last_name = tickets[-1]
+        tickets = [str(ticket) for ticket in tickets]
+        frappe.db.sql(
+            f"""
+            insert ignore into `tab{VIEW_STATE_DOCTYPE}`
+                (name, ticket, user, first_seen, last_seen, view_count,
+                creation, modified, owner, modified_by)
+            select
+                left(sha1(concat(reference_name, '::', viewed_by)), 20),
+                reference_name, viewed_by, min(creation), max(creation), count(*),
+                %(now)s, %(now)s, %(owner)s, %(owner)s
+            from `tabView Log`
+            where reference_doctype = 'HD Ticket'
+                and reference_name in %(tickets)s
+                and ifnull(viewed_by, '') != ''
+            group by reference_name, viewed_by
+            """,
+            {"tickets": tickets, "now": now, "owner": owner},
+        )
+        states = frappe.get_all(
+            VIEW_STATE_DOCTYPE,
+            filters={"ticket": ["in", tickets]},
+            fields=["name", "ticket", "user", "last_seen"],
+        )
+        insert_events(
+            [
+                (state.ticket, "view", state.last_seen, state.user, VIEW_STATE_DOCTYPE, state.name)
+                for state in states
+            ]
+        )
+        frappe.db.commit()
+
+
+def remove_ticket_view_states(doc, method=None):
+    """HD Ticket on_trash hook."""
+    frappe.db.delete(VIEW_STATE_DOCTYPE, {"ticket": doc.name})